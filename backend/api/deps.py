@@ -0,0 +1,121 @@
+"""
+Shared lookups for API routers
+Caches hot, rarely-changing reads so each request doesn't hit disk
+"""
+
+import os
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from cachetools import TTLCache
+from fastapi import HTTPException
+
+from src.chat_manager import ChatManager
+from src.models import Project
+from src.project_manager import ProjectManager
+
+# Initialize managers
+BASE_DIR = os.getenv("DATA_DIR", "data")
+pm = ProjectManager(BASE_DIR)
+cm = ChatManager(BASE_DIR)
+
+# Project metadata cache
+# Key: project_id, Value: Project (only hits are cached)
+_project_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_project_cache_lock = threading.Lock()
+
+# Chat existence cache
+# Key: (project_id, chat_id), only chats that exist are cached
+_chat_cache: TTLCache = TTLCache(maxsize=4096, ttl=30)
+_chat_cache_lock = threading.Lock()
+
+
+def get_project_cached(project_id: str) -> Optional[Project]:
+    """
+    Get project metadata, served from memory for up to 30 seconds
+
+    Args:
+        project_id: Project UUID
+
+    Returns:
+        Project object or None if not found
+    """
+    with _project_cache_lock:
+        project = _project_cache.get(project_id)
+    if project is not None:
+        return project
+
+    project = pm.get_project(project_id)
+    if project is not None:
+        with _project_cache_lock:
+            _project_cache[project_id] = project
+
+    return project
+
+
+def invalidate_project(project_id: str) -> None:
+    """Drop cached metadata for a project (call after any mutation)"""
+    with _project_cache_lock:
+        _project_cache.pop(project_id, None)
+
+
+def chat_exists_cached(project_id: str, chat_id: str) -> bool:
+    """Check if chat exists, served from memory for up to 30 seconds"""
+    key = (project_id, chat_id)
+    with _chat_cache_lock:
+        if key in _chat_cache:
+            return True
+
+    exists = cm.chat_exists(project_id, chat_id)
+    if exists:
+        with _chat_cache_lock:
+            _chat_cache[key] = True
+
+    return exists
+
+
+def invalidate_chat(project_id: str, chat_id: str) -> None:
+    """Drop cached existence for a chat (call after deletion)"""
+    with _chat_cache_lock:
+        _chat_cache.pop((project_id, chat_id), None)
+
+
+def ensure_project_and_chat(project_id: str, chat_id: str) -> Project:
+    """
+    Resolve a project/chat pair in one call, using the in-memory caches
+
+    Args:
+        project_id: Project UUID
+        chat_id: Chat UUID
+
+    Returns:
+        Project object
+
+    Raises:
+        HTTPException: 404 if the project or chat does not exist
+    """
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if not chat_exists_cached(project_id, chat_id):
+        raise HTTPException(status_code=404, detail="Chat not found")
+
+    return project
+
+
+@lru_cache(maxsize=4096)
+def static_url(prefix: str, path: str) -> str:
+    """
+    Build the /static URL for a generated file (memoized - the same plot and
+    download paths are rendered every time a chat's messages are listed)
+
+    Args:
+        prefix: Static sub-directory ("plots" or "downloads")
+        path: File path as stored on the message
+
+    Returns:
+        URL path, e.g. /static/plots/plot_x.png
+    """
+    return f"/static/{prefix}/{os.path.basename(path)}"
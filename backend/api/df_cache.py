@@ -0,0 +1,70 @@
+"""
+Process-wide DataFrame cache for API routers
+Keeps parsed current.csv DataFrames in memory, keyed by (project_id, version)
+"""
+
+import os
+import threading
+from typing import Optional
+
+import pandas as pd
+from cachetools import LRUCache
+
+from api.deps import BASE_DIR, get_project_cached
+from src.version_manager import VersionManager
+
+vm = VersionManager(BASE_DIR)
+
+# Cache is bounded by total DataFrame memory, not by entry count
+DF_CACHE_BYTES = int(os.getenv("DF_CACHE_MB", "2048")) * 1024 * 1024
+
+# Key: (project_id, current_version), Value: DataFrame
+_df_cache: LRUCache = LRUCache(
+    maxsize=DF_CACHE_BYTES,
+    getsizeof=lambda df: int(df.memory_usage(deep=True).sum())
+)
+_df_cache_lock = threading.Lock()
+
+
+def load_df_cached(project_id: str) -> Optional[pd.DataFrame]:
+    """
+    Load the current DataFrame for a project, parsing current.csv only on a miss
+
+    The returned DataFrame is shared between requests - treat it as read-only
+    and copy it before handing it to code that may modify it.
+
+    Args:
+        project_id: Project UUID
+
+    Returns:
+        DataFrame or None if project/CSV not found
+    """
+    project = get_project_cached(project_id)
+    if project is None:
+        return None
+
+    key = (project_id, project.current_version)
+    with _df_cache_lock:
+        df = _df_cache.get(key)
+    if df is not None:
+        return df
+
+    df = vm.load_current_dataframe(project_id)
+    if df is None:
+        return None
+
+    with _df_cache_lock:
+        try:
+            _df_cache[key] = df
+        except ValueError:
+            # DataFrame alone is larger than the whole cache - serve it uncached
+            pass
+
+    return df
+
+
+def invalidate_dataframe(project_id: str) -> None:
+    """Drop all cached DataFrames for a project (call after any mutation)"""
+    with _df_cache_lock:
+        for key in [k for k in _df_cache.keys() if k[0] == project_id]:
+            _df_cache.pop(key, None)
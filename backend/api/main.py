@@ -4,26 +4,100 @@ REST API for AI Data Analyst backend
 """
 
 import os
+import traceback
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 
+from api.responses import ORJSONResponse
+
 # Load environment variables
 load_dotenv()
 
 # Import routers (will be created next)
 from api.routers import projects, chats, ai_query
 
+# Threadpool size for sync routes (AnyIO defaults to 40 per process). Each
+# thread may hold a DataFrame while it works, so lower this for large datasets.
+ANYIO_THREADS = int(os.getenv("ANYIO_THREADS", "128"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Tune the worker process on startup"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = ANYIO_THREADS
+    yield
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Data Analyst API",
     description="REST API for conversational data analysis with AI",
     version="2.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+
+class APIGZipMiddleware(GZipMiddleware):
+    """GZip for JSON API responses - static plots/downloads are passed through untouched"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/static/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class JSONErrorMiddleware:
+    """
+    Unhandled errors become a JSON 500 here instead of every route wrapping its
+    body in try/except (HTTPExceptions keep FastAPI's default handling)
+    Added before CORSMiddleware so the 500 still gets CORS headers - an
+    app.exception_handler(Exception) runs outside CORS, where browsers can't
+    read it
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            print(f"Unhandled error on {scope['path']}: {exc}")
+            traceback.print_exc()
+            response = ORJSONResponse(status_code=500, content={"detail": str(exc)})
+            await response(scope, receive, send)
+
+
+# Compress large JSON payloads (EDA context, message history)
+app.add_middleware(APIGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# JSON 500s - must be added before (inside) CORS
+app.add_middleware(JSONErrorMiddleware)
+
 # CORS Configuration - Allow React frontend
 app.add_middleware(
     CORSMiddleware,
@@ -46,8 +120,13 @@ app.add_middleware(
 os.makedirs("data/plots", exist_ok=True)
 os.makedirs("data/temp_modifications", exist_ok=True)
 
-app.mount("/static/plots", StaticFiles(directory="data/plots"), name="plots")
-app.mount("/static/downloads", StaticFiles(directory="data/temp_modifications"), name="downloads")
+# In production, set SERVE_STATIC=false and let a reverse proxy serve these
+# paths straight from disk with sendfile (see API_README.md). The Starlette
+# mounts below read files in Python and push them through ASGI in chunks.
+if os.getenv("SERVE_STATIC", "true").lower() == "true":
+    app.mount("/static/plots", StaticFiles(directory="data/plots"), name="plots")
+    app.mount("/static/downloads", StaticFiles(directory="data/temp_modifications"), name="downloads")
+
 
 # Include routers
 app.include_router(projects.router, prefix="/api/projects", tags=["Projects"])
@@ -76,11 +155,6 @@ async def health_check():
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "api.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    from run_api import serve
+
+    serve()
@@ -4,14 +4,16 @@ Handles AI-powered data analysis queries
 """
 
 import os
+import threading
+from cachetools import LRUCache
 from fastapi import APIRouter, HTTPException
-from typing import Dict
+from fastapi.concurrency import run_in_threadpool
 
 from api.schemas import AIQueryRequest, AIQueryResponse
+from api.deps import ensure_project_and_chat, static_url
+from api.df_cache import load_df_cached
 from src.ai_agent import AIAgent
-from src.project_manager import ProjectManager
-from src.chat_manager import ChatManager
-from src.version_manager import VersionManager
+from src.models import Project
 from src.eda_utils import generate_eda_context
 
 router = APIRouter()
@@ -20,31 +22,146 @@ router = APIRouter()
 BASE_DIR = os.getenv("DATA_DIR", "data")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-pm = ProjectManager(BASE_DIR)
-cm = ChatManager(BASE_DIR)
-vm = VersionManager(BASE_DIR)
+MAX_ACTIVE_AGENTS = int(os.getenv("MAX_ACTIVE_AGENTS", "64"))
 
-# Global dict to store AI agents per chat
+# EDA context strings shared by every chat on the same dataset version
+# Key: (project_id, current_version), Value: context string
+_eda_cache: LRUCache = LRUCache(maxsize=256)
+_eda_cache_lock = threading.Lock()
+
+
+class AgentCache(LRUCache):
+    """
+    LRU cache of AI agents that collects agents as they are evicted
+    Bounds the number of live DataFrames / Gemini sessions per worker.
+    Evicted agents are closed by the caller once _agents_lock is released -
+    closing waits for the agent's running query and stops its code worker.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self._evicted: list = []
+
+    def popitem(self):
+        key, agent = super().popitem()
+        self._evicted.append((key, agent))
+        return key, agent
+
+    def take_evicted(self) -> list:
+        """Return and forget the (key, agent) pairs evicted so far (hold _agents_lock)"""
+        evicted, self._evicted = self._evicted, []
+        return evicted
+
+
+# Bounded cache of AI agents per chat (least recently used evicted first)
 # Key: f"{project_id}_{chat_id}", Value: AIAgent instance
-active_agents: Dict[str, AIAgent] = {}
+active_agents = AgentCache(maxsize=MAX_ACTIVE_AGENTS)
+# Guards active_agents - queries and chat/project mutations both run in the threadpool
+_agents_lock = threading.Lock()
 
 
-def get_or_create_agent(project_id: str, chat_id: str) -> AIAgent:
+def evict_agent(project_id: str, chat_id: str) -> bool:
     """
-    Get existing AI agent for a chat or create new one
+    Drop and close the AI agent for a chat, if one is active
+
+    Call before deleting or clearing a chat so the agent's DataFrame and
+    LLM history are released immediately (closing saves Gemini history,
+    so it must run before the chat is mutated).
 
     Args:
         project_id: Project UUID
         chat_id: Chat UUID
 
+    Returns:
+        True if an agent was evicted, False if none was active
+    """
+    with _agents_lock:
+        agent = active_agents.pop(f"{project_id}_{chat_id}", None)
+
+    if agent is None:
+        return False
+
+    try:
+        agent.close_session()
+    except Exception as e:
+        print(f"Error closing agent for chat {chat_id}: {e}")
+    return True
+
+
+def evict_project_agents(project_id: str) -> int:
+    """
+    Drop and close all AI agents for a project
+
+    Args:
+        project_id: Project UUID
+
+    Returns:
+        Number of agents evicted
+    """
+    prefix = f"{project_id}_"
+    with _agents_lock:
+        agents = [
+            active_agents.pop(key)
+            for key in [k for k in active_agents.keys() if k.startswith(prefix)]
+        ]
+
+    for agent in agents:
+        try:
+            agent.close_session()
+        except Exception as e:
+            print(f"Error closing agent for project {project_id}: {e}")
+    return len(agents)
+
+
+def get_eda_context_cached(project: Project, df) -> str:
+    """
+    Get the EDA context for a project's current version, generating it on a miss
+
+    Args:
+        project: Project (current_version identifies the dataset)
+        df: Current DataFrame for the project
+
+    Returns:
+        EDA context string
+    """
+    key = (project.id, project.current_version)
+    with _eda_cache_lock:
+        context = _eda_cache.get(key)
+    if context is not None:
+        return context
+
+    context = generate_eda_context(df, project.name)
+    with _eda_cache_lock:
+        _eda_cache[key] = context
+
+    return context
+
+
+def invalidate_eda_context(project_id: str) -> None:
+    """Drop cached EDA context for all versions of a project"""
+    with _eda_cache_lock:
+        for key in [k for k in _eda_cache.keys() if k[0] == project_id]:
+            _eda_cache.pop(key, None)
+
+
+def get_or_create_agent(project: Project, chat_id: str) -> AIAgent:
+    """
+    Get existing AI agent for a chat or create new one
+
+    Args:
+        project: Project (already resolved by ensure_project_and_chat)
+        chat_id: Chat UUID
+
     Returns:
         AIAgent instance
     """
+    project_id = project.id
     agent_key = f"{project_id}_{chat_id}"
 
-    # Check if agent already exists
-    if agent_key in active_agents:
-        agent = active_agents[agent_key]
+    # Check if agent already exists (get() also marks it as recently used)
+    with _agents_lock:
+        agent = active_agents.get(agent_key)
+    if agent is not None:
         # Verify it's still configured for the same project/chat
         if agent.current_project_id == project_id and agent.current_chat_id == chat_id:
             return agent
@@ -55,32 +172,43 @@ def get_or_create_agent(project_id: str, chat_id: str) -> AIAgent:
 
     agent = AIAgent(api_key=GEMINI_API_KEY, base_dir=BASE_DIR)
 
-    # Load dataframe
-    df = vm.load_current_dataframe(project_id)
+    # Load dataframe only when building an agent (copied below - generated
+    # code may modify it in place)
+    df = load_df_cached(project_id)
     if df is None:
         raise HTTPException(status_code=500, detail="Failed to load project dataframe")
 
-    # Get project
-    project = pm.get_project(project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    # Generate EDA context
-    dataset_context = generate_eda_context(df, project.name)
+    # EDA context is identical for every chat on this dataset version
+    dataset_context = get_eda_context_cached(project, df)
 
     # Start chat session
     success = agent.start_chat_session(
         project_id=project_id,
         chat_id=chat_id,
-        dataframe=df,
+        dataframe=df.copy(),
         dataset_context=dataset_context
     )
 
     if not success:
         raise HTTPException(status_code=500, detail="Failed to start AI chat session")
 
-    # Store agent
-    active_agents[agent_key] = agent
+    # Store agent (unless a concurrent request for the same chat got there first)
+    with _agents_lock:
+        existing = active_agents.get(agent_key)
+        if existing is None or existing.current_chat_id != chat_id:
+            active_agents[agent_key] = agent
+            existing = None
+        evicted = active_agents.take_evicted()
+
+    for key, evicted_agent in evicted:
+        try:
+            evicted_agent.close_session()
+        except Exception as e:
+            print(f"Error closing evicted agent {key}: {e}")
+
+    if existing is not None:
+        agent.close_session()
+        return existing
 
     return agent
 
@@ -98,61 +226,49 @@ async def query_ai(project_id: str, chat_id: str, request: AIQueryRequest):
     Returns:
         AI response with code, explanation, and results
     """
-    try:
-        # Verify project exists
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Verify chat exists
-        if not cm.chat_exists(project_id, chat_id):
-            raise HTTPException(status_code=404, detail="Chat not found")
-
-        # Get or create AI agent
-        agent = get_or_create_agent(project_id, chat_id)
-
-        # Process query
-        result = agent.process_query(request.query)
-
-        # Check if successful
-        if not result.get("success", False):
-            return AIQueryResponse(
-                success=False,
-                output_type="exploratory",
-                code="",
-                explanation="",
-                error=result.get("error", "Unknown error occurred")
-            )
-
-        # Build response with URLs for static files
-        response = AIQueryResponse(
-            success=True,
-            output_type=result.get("output_type", "exploratory"),
-            code=result.get("code", ""),
-            explanation=result.get("explanation", ""),
-            output=result.get("output"),
-            result=result.get("result")
+    # Verify project and chat exist (cached - a miss reads their files, so off the event loop)
+    project = await run_in_threadpool(ensure_project_and_chat, project_id, chat_id)
+
+    # Get or create AI agent (building one loads the DataFrame and starts its worker)
+    agent = await run_in_threadpool(get_or_create_agent, project, chat_id)
+
+    # Process query off the event loop - Gemini calls for other chats proceed meanwhile
+    result = await agent.process_query_async(request.query, arrow_output=request.arrow)
+
+    # Check if successful
+    if not result.get("success", False):
+        return AIQueryResponse(
+            success=False,
+            output_type="exploratory",
+            code="",
+            explanation="",
+            error=result.get("error", "Unknown error occurred")
         )
 
-        # Add plot URL if plot was generated
-        if result.get("plot_path"):
-            plot_filename = os.path.basename(result["plot_path"])
-            response.plot_path = result["plot_path"]
-            response.plot_url = f"/static/plots/{plot_filename}"
+    # Build response with URLs for static files
+    response = AIQueryResponse(
+        success=True,
+        output_type=result.get("output_type", "exploratory"),
+        code=result.get("code", ""),
+        explanation=result.get("explanation", ""),
+        output=result.get("output"),
+        result=result.get("result")
+    )
 
-        # Add download URL if dataframe was modified
-        if result.get("modified_dataframe_path"):
-            csv_filename = os.path.basename(result["modified_dataframe_path"])
-            response.modified_dataframe_path = result["modified_dataframe_path"]
-            response.download_url = f"/static/downloads/{csv_filename}"
-            response.modification_summary = result.get("modification_summary")
+    # Add plot URL if plot was generated
+    if result.get("plot_path"):
+        response.plot_path = result["plot_path"]
+        response.plot_url = static_url("plots", result["plot_path"])
 
-        return response
+    # Add download URL if dataframe was modified
+    if result.get("modified_dataframe_path"):
+        response.modified_dataframe_path = result["modified_dataframe_path"]
+        response.download_url = static_url("downloads", result["modified_dataframe_path"])
+        response.modification_summary = result.get("modification_summary")
+        if result.get("modified_arrow_path"):
+            response.arrow_url = static_url("downloads", result["modified_arrow_path"])
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return response
 
 
 @router.delete("/{project_id}/{chat_id}/session")
@@ -167,17 +283,11 @@ async def clear_ai_session(project_id: str, chat_id: str):
     Returns:
         Success message
     """
-    try:
-        agent_key = f"{project_id}_{chat_id}"
+    # Closing waits for a running query and stops the agent's code worker
+    if await run_in_threadpool(evict_agent, project_id, chat_id):
+        return {"success": True, "message": "AI session cleared"}
 
-        if agent_key in active_agents:
-            del active_agents[agent_key]
-            return {"success": True, "message": "AI session cleared"}
-
-        return {"success": True, "message": "No active session found"}
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"success": True, "message": "No active session found"}
 
 
 @router.get("/health")
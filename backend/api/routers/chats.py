@@ -13,223 +13,200 @@ from api.schemas import (
     MessageResponse,
     ErrorResponse
 )
+from api.deps import get_project_cached, invalidate_chat, static_url
+from api.responses import ORJSONResponse
+from api.routers.ai_query import evict_agent
 from src.chat_manager import ChatManager
-from src.project_manager import ProjectManager
 
 router = APIRouter()
 
+# Handlers that only call the disk-backed managers are plain `def` so FastAPI
+# runs them in its threadpool instead of blocking the event loop.
+
 # Initialize managers
 BASE_DIR = os.getenv("DATA_DIR", "data")
 cm = ChatManager(BASE_DIR)
-pm = ProjectManager(BASE_DIR)
 
 
-@router.get("/{project_id}", response_model=List[ChatResponse])
-async def list_chats(project_id: str):
+# Hot read endpoints below skip response_model validation and return
+# ORJSONResponse directly; the models are still published in the OpenAPI docs.
+@router.get("/{project_id}", responses={200: {"model": List[ChatResponse]}})
+def list_chats(project_id: str):
     """List all chats for a project"""
-    try:
-        # Verify project exists
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Get chats
-        chats = cm.list_chats(project_id)
-
-        return [
-            ChatResponse(
-                id=chat.id,
-                project_id=chat.project_id,
-                name=chat.name,
-                created_at=chat.created_at,
-                updated_at=chat.updated_at,
-                message_count=chat.message_count
-            )
-            for chat in chats
-        ]
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Verify project exists
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Get chats
+    chats = cm.list_chats(project_id)
+
+    return ORJSONResponse(content=[
+        {
+            "id": chat.id,
+            "project_id": chat.project_id,
+            "name": chat.name,
+            "created_at": chat.created_at,
+            "updated_at": chat.updated_at,
+            "message_count": chat.message_count
+        }
+        for chat in chats
+    ])
 
 
 @router.post("/{project_id}", response_model=ChatResponse)
-async def create_chat(project_id: str, chat_data: ChatCreate):
+def create_chat(project_id: str, chat_data: ChatCreate):
     """Create a new chat for a project"""
-    try:
-        # Verify project exists
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Create chat
-        chat = cm.create_chat(
-            project_id=project_id,
-            chat_name=chat_data.name
-        )
-
-        if not chat:
-            raise HTTPException(status_code=500, detail="Failed to create chat")
-
-        return ChatResponse(
-            id=chat.id,
-            project_id=chat.project_id,
-            name=chat.name,
-            created_at=chat.created_at,
-            updated_at=chat.updated_at,
-            message_count=chat.message_count
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Verify project exists
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Create chat
+    chat = cm.create_chat(
+        project_id=project_id,
+        chat_name=chat_data.name
+    )
+
+    if not chat:
+        raise HTTPException(status_code=500, detail="Failed to create chat")
+
+    return ChatResponse(
+        id=chat.id,
+        project_id=chat.project_id,
+        name=chat.name,
+        created_at=chat.created_at,
+        updated_at=chat.updated_at,
+        message_count=chat.message_count
+    )
 
 
 @router.get("/{project_id}/{chat_id}", response_model=ChatResponse)
-async def get_chat(project_id: str, chat_id: str):
+def get_chat(project_id: str, chat_id: str):
     """Get chat by ID"""
-    try:
-        # Verify project exists
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Get chat
-        chat = cm.get_chat_metadata(project_id, chat_id)
-        if not chat:
-            raise HTTPException(status_code=404, detail="Chat not found")
-
-        return ChatResponse(
-            id=chat.id,
-            project_id=chat.project_id,
-            name=chat.name,
-            created_at=chat.created_at,
-            updated_at=chat.updated_at,
-            message_count=chat.message_count
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Verify project exists
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Get chat
+    chat = cm.get_chat_metadata(project_id, chat_id)
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found")
+
+    return ChatResponse(
+        id=chat.id,
+        project_id=chat.project_id,
+        name=chat.name,
+        created_at=chat.created_at,
+        updated_at=chat.updated_at,
+        message_count=chat.message_count
+    )
 
 
 @router.patch("/{project_id}/{chat_id}", response_model=ChatResponse)
-async def update_chat(project_id: str, chat_id: str, chat_data: ChatCreate):
+def update_chat(project_id: str, chat_id: str, chat_data: ChatCreate):
     """Update/rename a chat"""
-    try:
-        # Verify project exists
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Update chat
-        chat = cm.rename_chat(project_id, chat_id, chat_data.name)
-        if not chat:
-            raise HTTPException(status_code=404, detail="Chat not found or failed to update")
-
-        return ChatResponse(
-            id=chat.id,
-            project_id=chat.project_id,
-            name=chat.name,
-            created_at=chat.created_at,
-            updated_at=chat.updated_at,
-            message_count=chat.message_count
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Verify project exists
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Update chat
+    chat = cm.rename_chat(project_id, chat_id, chat_data.name)
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found or failed to update")
+
+    return ChatResponse(
+        id=chat.id,
+        project_id=chat.project_id,
+        name=chat.name,
+        created_at=chat.created_at,
+        updated_at=chat.updated_at,
+        message_count=chat.message_count
+    )
 
 
 @router.delete("/{project_id}/{chat_id}")
-async def delete_chat(project_id: str, chat_id: str):
+def delete_chat(project_id: str, chat_id: str):
     """Delete a chat"""
-    try:
-        # Verify project exists
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Delete chat
-        success = cm.delete_chat(project_id, chat_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Chat not found or failed to delete")
-
-        return {"success": True, "message": "Chat deleted"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/{project_id}/{chat_id}/messages", response_model=List[MessageResponse])
-async def get_chat_messages(project_id: str, chat_id: str):
+    # Verify project exists
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Release the chat's AI agent before its files go away
+    evict_agent(project_id, chat_id)
+
+    # Delete chat
+    success = cm.delete_chat(project_id, chat_id)
+    invalidate_chat(project_id, chat_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Chat not found or failed to delete")
+
+    return {"success": True, "message": "Chat deleted"}
+
+
+@router.get("/{project_id}/{chat_id}/messages", responses={200: {"model": List[MessageResponse]}})
+def get_chat_messages(project_id: str, chat_id: str):
     """Get all messages for a chat"""
-    try:
-        # Verify project exists
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Get messages
-        messages = cm.get_messages(project_id, chat_id)
-
-        result = []
-        for msg in messages:
-            # Build response with URLs for static files
-            response_data = {
-                "id": msg.id,
-                "chat_id": msg.chat_id,
-                "role": msg.role,
-                "content": msg.content,
-                "timestamp": msg.timestamp,
-                "output_type": msg.output_type,
-                "code": msg.code,
-                "output": msg.output,
-                "result": msg.result,
-                "plot_path": msg.plot_path,
-                "modified_dataframe_path": msg.modified_dataframe_path,
-                "modification_summary": msg.modification_summary,
-                "explanation": msg.explanation,
-                "plot_url": None,
-                "download_url": None
-            }
-
-            # Generate plot URL if plot exists
-            if msg.plot_path:
-                plot_filename = os.path.basename(msg.plot_path)
-                response_data["plot_url"] = f"/static/plots/{plot_filename}"
-
-            # Generate download URL if modified dataframe exists
-            if msg.modified_dataframe_path:
-                csv_filename = os.path.basename(msg.modified_dataframe_path)
-                response_data["download_url"] = f"/static/downloads/{csv_filename}"
-
-            result.append(MessageResponse(**response_data))
-
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Verify project exists
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Get messages
+    messages = cm.get_messages(project_id, chat_id)
+
+    result = []
+    for msg in messages:
+        # Build response with URLs for static files
+        response_data = {
+            "id": msg.id,
+            "chat_id": msg.chat_id,
+            "role": msg.role,
+            "content": msg.content,
+            "timestamp": msg.timestamp,
+            "output_type": msg.output_type,
+            "code": msg.code,
+            "output": msg.output,
+            "result": msg.result,
+            "plot_path": msg.plot_path,
+            "modified_dataframe_path": msg.modified_dataframe_path,
+            "modification_summary": msg.modification_summary,
+            "explanation": msg.explanation,
+            "plot_url": None,
+            "download_url": None
+        }
+
+        # Generate plot URL if plot exists
+        if msg.plot_path:
+            response_data["plot_url"] = static_url("plots", msg.plot_path)
+
+        # Generate download URL if modified dataframe exists
+        if msg.modified_dataframe_path:
+            response_data["download_url"] = static_url("downloads", msg.modified_dataframe_path)
+
+        result.append(response_data)
+
+    return ORJSONResponse(content=result)
 
 
 @router.delete("/{project_id}/{chat_id}/messages")
-async def clear_chat_messages(project_id: str, chat_id: str):
+def clear_chat_messages(project_id: str, chat_id: str):
     """Clear all messages from a chat (keep chat metadata)"""
-    try:
-        # Verify project exists
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Clear messages
-        success = cm.clear_chat_messages(project_id, chat_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Chat not found or failed to clear messages")
-
-        return {"success": True, "message": "Chat messages cleared"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Verify project exists
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Release the chat's AI agent first - closing it saves Gemini history,
+    # which the clear below must overwrite
+    evict_agent(project_id, chat_id)
+
+    # Clear messages
+    success = cm.clear_chat_messages(project_id, chat_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Chat not found or failed to clear messages")
+
+    return {"success": True, "message": "Chat messages cleared"}
@@ -4,10 +4,18 @@ Handles project creation, retrieval, and management
 """
 
 import os
+import tempfile
+from itertools import islice
+import orjson
 import pandas as pd
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 
+from api.deps import get_project_cached, invalidate_project
+from api.df_cache import load_df_cached, invalidate_dataframe
+from api.routers.ai_query import evict_project_agents, invalidate_eda_context
+from api.responses import ORJSONResponse
 from api.schemas import (
     ProjectResponse,
     FileUploadResponse,
@@ -15,61 +23,56 @@ from api.schemas import (
     ErrorResponse
 )
 from src.project_manager import ProjectManager
-from src.version_manager import VersionManager
-from src.eda_utils import generate_eda_context
+from src.utils import read_csv_fast
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Handlers that only call the disk-backed managers are plain `def` so FastAPI
+# runs them in its threadpool instead of blocking the event loop.
+
 # Initialize managers
 BASE_DIR = os.getenv("DATA_DIR", "data")
 pm = ProjectManager(BASE_DIR)
-vm = VersionManager(BASE_DIR)
 
 
 @router.get("/", response_model=List[ProjectResponse])
-async def list_projects():
+def list_projects():
     """Get all projects"""
-    try:
-        projects = pm.list_all_projects()
-        return [
-            ProjectResponse(
-                id=p.id,
-                name=p.name,
-                original_filename=p.original_filename,
-                total_rows=p.total_rows,
-                total_columns=p.total_columns,
-                created_at=p.created_at,
-                updated_at=p.updated_at,
-                current_version=p.current_version
-            )
-            for p in projects
-        ]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    projects = pm.list_all_projects()
+    return [
+        ProjectResponse(
+            id=p.id,
+            name=p.name,
+            original_filename=p.original_filename,
+            total_rows=p.total_rows,
+            total_columns=p.total_columns,
+            created_at=p.created_at,
+            updated_at=p.updated_at,
+            current_version=p.current_version
+        )
+        for p in projects
+    ]
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: str):
+def get_project(project_id: str):
     """Get project by ID"""
-    try:
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        return ProjectResponse(
-            id=project.id,
-            name=project.name,
-            original_filename=project.original_filename,
-            total_rows=project.total_rows,
-            total_columns=project.total_columns,
-            created_at=project.created_at,
-            updated_at=project.updated_at,
-            current_version=project.current_version
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return ProjectResponse(
+        id=project.id,
+        name=project.name,
+        original_filename=project.original_filename,
+        total_rows=project.total_rows,
+        total_columns=project.total_columns,
+        created_at=project.created_at,
+        updated_at=project.updated_at,
+        current_version=project.current_version
+    )
 
 
 @router.post("/upload", response_model=FileUploadResponse)
@@ -78,22 +81,27 @@ async def upload_project(
     project_name: str = Form(...)
 ):
     """Upload CSV and create new project"""
+    tmp_path = None
     try:
         # Validate file type
         if not file.filename.endswith(('.csv', '.CSV')):
             raise HTTPException(status_code=400, detail="Only CSV files are supported")
 
-        # Read CSV
-        contents = await file.read()
+        # Stream upload to a temp file instead of holding raw bytes + DataFrame in memory
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+            tmp_path = tmp.name
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
 
-        # Try to parse CSV
+        # Try to parse CSV (off the event loop)
         try:
-            df = pd.read_csv(pd.io.common.BytesIO(contents))
+            df = await run_in_threadpool(read_csv_fast, tmp_path)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to parse CSV: {str(e)}")
 
         # Create project
-        project = pm.create_project(
+        project = await run_in_threadpool(
+            pm.create_project,
             csv_dataframe=df,
             original_filename=file.filename,
             project_name=project_name
@@ -113,85 +121,118 @@ async def upload_project(
             message="Failed to create project",
             error=str(e)
         )
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
 
 
 @router.delete("/{project_id}")
-async def delete_project(project_id: str):
+def delete_project(project_id: str):
     """Delete project"""
-    try:
-        success = pm.delete_project(project_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Project not found")
-        return {"success": True, "message": "Project deleted"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
+    # Release all of the project's AI agents before its files go away
+    evict_project_agents(project_id)
+
+    success = pm.delete_project(project_id)
+    invalidate_project(project_id)
+    invalidate_dataframe(project_id)
+    invalidate_eda_context(project_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return {"success": True, "message": "Project deleted"}
+
+
+def _build_context(df: pd.DataFrame, dataset_name: str) -> dict:
+    """
+    Build the EDA context payload for a DataFrame
+    CPU-bound - callers must run it off the event loop
+
+    Args:
+        df: Current project DataFrame (not modified)
+        dataset_name: Project name
+
+    Returns:
+        Dict matching EDAContextResponse
+    """
+    # Column-wide reductions computed once instead of per column
+    total_rows = len(df)
+    non_nulls = df.notna().sum()
+    nuniques = df.nunique()
+    numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    mins = df[numeric_cols].min()
+    maxs = df[numeric_cols].max()
+
+    # value_counts for low-cardinality columns, shared by columns and distributions
+    value_counts_by_col = {
+        col: df[col].value_counts()
+        for col in df.columns
+        if 0 < nuniques[col] <= 20
+    }
+
+    columns_info = []
+    for col in df.columns:
+        non_null = int(non_nulls[col])
+        col_info = {
+            "name": col,
+            "dtype": str(df[col].dtype),
+            "non_null": non_null,
+            "unique": int(nuniques[col])
+        }
+
+        # Add range for numeric columns
+        if col in mins.index and non_null > 0:
+            col_info["min"] = float(mins[col])
+            col_info["max"] = float(maxs[col])
+
+        # Add top values for low-cardinality columns
+        value_counts = value_counts_by_col.get(col)
+        if value_counts is not None:
+            col_info["values"] = [
+                {"value": str(k), "count": int(v)}
+                for k, v in value_counts.items()
+            ]
 
-@router.get("/{project_id}/context", response_model=EDAContextResponse)
-async def get_project_context(project_id: str):
-    """Get EDA context for project"""
-    try:
-        project = pm.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Load current dataframe
-        df = vm.load_current_dataframe(project_id)
-
-        # Generate EDA context
-        context_str = generate_eda_context(df, project.name)
-
-        # Parse context for structured response
-        columns_info = []
-        for col in df.columns:
-            col_info = {
-                "name": col,
-                "dtype": str(df[col].dtype),
-                "non_null": int(df[col].notna().sum()),
-                "unique": int(df[col].nunique())
+        columns_info.append(col_info)
+
+    # Get distributions for low-cardinality columns (limit to 10)
+    distributions = {}
+    low_card_cols = (col for col in value_counts_by_col if nuniques[col] > 1)
+    for col in islice(low_card_cols, 10):
+        distributions[col] = [
+            {
+                "value": str(k),
+                "count": int(v),
+                "percentage": round(v / total_rows * 100, 2)
             }
+            for k, v in value_counts_by_col[col].items()
+        ]
 
-            # Add range for numeric columns
-            if pd.api.types.is_numeric_dtype(df[col]) and df[col].notna().any():
-                col_info["min"] = float(df[col].min())
-                col_info["max"] = float(df[col].max())
-
-            # Add top values for low-cardinality columns
-            if df[col].nunique() <= 20 and df[col].nunique() > 0:
-                value_counts = df[col].value_counts()
-                col_info["values"] = [
-                    {"value": str(k), "count": int(v)}
-                    for k, v in value_counts.items()
-                ]
-
-            columns_info.append(col_info)
-
-        # Get distributions for low-cardinality columns
-        distributions = {}
-        low_card_cols = [col for col in df.columns if df[col].nunique() <= 20 and df[col].nunique() > 1]
-        for col in low_card_cols[:10]:  # Limit to 10
-            value_counts = df[col].value_counts()
-            distributions[col] = [
-                {
-                    "value": str(k),
-                    "count": int(v),
-                    "percentage": round(v / len(df) * 100, 2)
-                }
-                for k, v in value_counts.items()
-            ]
+    return {
+        "dataset_name": dataset_name,
+        "total_rows": total_rows,
+        "total_columns": len(df.columns),
+        "columns": columns_info,
+        # pandas' C JSON writer emits the rows directly; orjson embeds the
+        # bytes as-is instead of walking a list of per-cell Python objects
+        "sample_data": orjson.Fragment(
+            df.head(10).to_json(orient='records', date_format='iso', double_precision=15)
+        ),
+        "distributions": distributions if distributions else None
+    }
 
-        return EDAContextResponse(
-            dataset_name=project.name,
-            total_rows=len(df),
-            total_columns=len(df.columns),
-            columns=columns_info,
-            sample_data=df.head(10).to_dict(orient='records'),
-            distributions=distributions if distributions else None
-        )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.get("/{project_id}/context", response_model=EDAContextResponse)
+def get_project_context(project_id: str):
+    """Get EDA context for project"""
+    project = get_project_cached(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Load current dataframe (shared cache - read-only here)
+    df = load_df_cached(project_id)
+    if df is None:
+        raise HTTPException(status_code=500, detail="Failed to load project dataframe")
+
+    # Handler is sync, so the scans below already run in the threadpool.
+    # Return the payload directly - response_model is kept for the OpenAPI
+    # schema, but re-validating thousands of keys through Pydantic is skipped
+    return ORJSONResponse(content=_build_context(df, project.name))
@@ -93,6 +93,7 @@ class MessageResponse(MessageBase):
 
 class AIQueryRequest(BaseModel):
     query: str
+    arrow: bool = False  # Also return modified datasets as an Arrow IPC stream
 
 
 class AIQueryResponse(BaseModel):
@@ -106,6 +107,7 @@ class AIQueryResponse(BaseModel):
     plot_url: Optional[str] = None  # URL for frontend to fetch
     modified_dataframe_path: Optional[str] = None
     download_url: Optional[str] = None  # URL for CSV download
+    arrow_url: Optional[str] = None  # URL for Arrow IPC stream download (if requested)
     modification_summary: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
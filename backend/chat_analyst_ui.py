@@ -20,7 +20,13 @@ from src.project_manager import ProjectManager
 from src.chat_manager import ChatManager
 from src.version_manager import VersionManager
 from src.ai_agent import AIAgent
-from src.eda_utils import generate_eda_context
+from src.eda_utils import optimize_dtypes
+from src.utils import (
+    get_current_csv_path,
+    get_metadata_path,
+    get_project_directory,
+    read_csv_fast
+)
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -37,9 +43,10 @@ st.set_page_config(
 # CUSTOM CSS - Glass Effect, Cards, Animations
 # ============================================================================
 
-def inject_custom_css():
-    """Inject custom CSS for modern UI styling"""
-    st.markdown("""
+@st.cache_resource
+def _custom_css() -> str:
+    """Build the custom CSS block once per server process"""
+    return """
     <style>
     /* Import Inter font */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&family=Fira+Code&display=swap');
@@ -188,14 +195,41 @@ def inject_custom_css():
         to { opacity: 1; transform: translateY(0); }
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def inject_custom_css():
+    """
+    Inject custom CSS for modern UI styling
+    Must run on every rerun - Streamlit drops elements a run doesn't emit,
+    so a once-per-session <style> block would vanish on the next rerun
+    """
+    st.markdown(_custom_css(), unsafe_allow_html=True)
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
 # ============================================================================
 
+@st.cache_resource
+def get_managers(base_dir: str):
+    """
+    Create the backend managers once per server process and share them
+    across sessions and reruns
+
+    Args:
+        base_dir: Data directory root
+
+    Returns:
+        Tuple of (ProjectManager, ChatManager, VersionManager)
+    """
+    return ProjectManager(base_dir), ChatManager(base_dir), VersionManager(base_dir)
+
+
 def init_session_state():
-    """Initialize Streamlit session state variables"""
+    """Initialize Streamlit session state variables (once per session)"""
+
+    if st.session_state.get('_session_initialized'):
+        return
 
     # Navigation state
     if 'view' not in st.session_state:
@@ -217,9 +251,10 @@ def init_session_state():
     # Backend managers (initialized once)
     if 'pm' not in st.session_state:
         base_dir = os.getenv('DATA_DIR', 'data')
-        st.session_state.pm = ProjectManager(base_dir)
-        st.session_state.cm = ChatManager(base_dir)
-        st.session_state.vm = VersionManager(base_dir)
+        pm, cm, vm = get_managers(base_dir)
+        st.session_state.pm = pm
+        st.session_state.cm = cm
+        st.session_state.vm = vm
         st.session_state.base_dir = base_dir
 
     # AI Agent (initialized per chat session)
@@ -230,6 +265,8 @@ def init_session_state():
     if 'messages' not in st.session_state:
         st.session_state.messages = []
 
+    st.session_state._session_initialized = True
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -253,10 +290,23 @@ def format_timestamp(dt):
     else:
         return dt.strftime("%b %d, %Y")
 
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_project(base_dir, project_id, metadata_mtime_ns):
+    """
+    Project metadata, read once per change to its metadata.json (every
+    save atomically replaces the file, so the mtime always moves)
+    """
+    pm, _, _ = get_managers(base_dir)
+    return pm.get_project(project_id)
+
 def safe_get_project(project_id):
     """Safely get project with error handling"""
     try:
-        return st.session_state.pm.get_project(project_id)
+        base_dir = st.session_state.base_dir
+        metadata_mtime = file_mtime(get_metadata_path(base_dir, project_id))
+        if metadata_mtime is None:
+            return None
+        return _cached_project(base_dir, project_id, metadata_mtime)
     except Exception as e:
         st.error(f"Error loading project: {e}")
         return None
@@ -269,6 +319,212 @@ def safe_get_chat(project_id, chat_id):
         st.error(f"Error loading chat: {e}")
         return None
 
+def get_data_version_key(project):
+    """
+    Cache key for a project's current data - the version number plus the
+    current.csv mtime, so any rewrite of the file misses the cache
+
+    Args:
+        project: Project object
+
+    Returns:
+        Version key string
+    """
+    current_path = get_current_csv_path(st.session_state.base_dir, project.id)
+    try:
+        mtime = os.stat(current_path).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return f"{project.current_version}:{mtime}"
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_load_df(base_dir, project_id, version_key):
+    """
+    Load a project's current DataFrame once per data version
+
+    Args:
+        base_dir: Data directory root
+        project_id: Project UUID
+        version_key: Key from get_data_version_key (only used for caching)
+
+    Returns:
+        DataFrame or None if not found
+    """
+    _, _, vm = get_managers(base_dir)
+    return vm.load_current_dataframe(project_id)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_display_df(base_dir, project_id, version_key):
+    """
+    Compact copy of a project's DataFrame for the data-context modal
+    (downcast numerics, category for low-cardinality text) - smaller to
+    keep cached and faster to restore on every modal rerun
+
+    Returns:
+        DataFrame or None if not found
+    """
+    df = _cached_load_df(base_dir, project_id, version_key)
+    return optimize_dtypes(df) if df is not None else None
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_eda_context(base_dir, project_id, version_key):
+    """
+    EDA context string for the AI agent, generated once per data version so
+    switching back to a chat doesn't rescan the whole DataFrame (and read
+    from the project's eda_context.json after a restart)
+
+    Returns:
+        EDA context string
+    """
+    pm, _, _ = get_managers(base_dir)
+    return pm.get_eda_context(project_id)
+
+# Rows probed before the full low-cardinality scan in _cached_column_profile
+LOW_CARDINALITY_PROBE_ROWS = 1000
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_column_profile(base_dir, project_id, version_key):
+    """
+    Per-column profile for the data-context modal, from one vectorized pass
+    over the DataFrame and cached per data version
+
+    Computed on the DataFrame as stored, so the reported types are the
+    ones the AI agent works with
+
+    Returns:
+        Tuple of (column info DataFrame, low-cardinality column names,
+        overall missing-value percentage, numeric column count, text
+        column count)
+    """
+    df = _cached_load_df(base_dir, project_id, version_key)
+    n = len(df)
+
+    nulls = df.isnull().sum()
+    null_pct = nulls / n * 100 if n else nulls.astype(float)
+    col_info = pd.DataFrame({
+        "Column": df.columns,
+        "Type": df.dtypes.astype(str).values,
+        "Nulls": [f"{pct:.1f}%" for pct in null_pct.values]
+    })
+
+    # A column with more than 20 distinct values in its first rows can't be
+    # low-cardinality, so the full nunique() scan only runs on the rest
+    # (this drops ID-like and free-text columns after a short head probe)
+    head_nunique = df.head(LOW_CARDINALITY_PROBE_ROWS).nunique()
+    candidates = df.columns[head_nunique <= 20]
+    nunique = df[candidates].nunique()
+    low_cardinality_cols = nunique.index[(nunique > 1) & (nunique <= 20)].tolist()
+
+    cells = n * len(df.columns)
+    missing_pct = nulls.sum() / cells * 100 if cells else 0.0
+
+    # One pass over the dtypes, matching select_dtypes(include=['number'])
+    # and select_dtypes(include=['object', 'string'])
+    numeric_count = text_count = 0
+    for dtype in df.dtypes:
+        if ((pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype))
+                or pd.api.types.is_timedelta64_dtype(dtype)):
+            numeric_count += 1
+        elif (pd.api.types.is_object_dtype(dtype)
+                or (pd.api.types.is_string_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype))):
+            text_count += 1
+
+    return col_info, low_cardinality_cols, missing_pct, numeric_count, text_count
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_value_distribution(base_dir, project_id, version_key, col):
+    """
+    Value counts and the distribution table for one column in the
+    data-context modal, cached per data version
+
+    Returns:
+        Tuple of (value_counts Series, distribution DataFrame)
+    """
+    df = _cached_display_df(base_dir, project_id, version_key)
+    value_counts = df[col].value_counts()
+    if isinstance(value_counts.index, pd.CategoricalIndex):
+        # Chart and table show the plain values, not category codes
+        value_counts.index = value_counts.index.astype(value_counts.index.categories.dtype)
+    dist_df = pd.DataFrame({
+        'Value': value_counts.index.astype(str),
+        'Count': value_counts.values,
+        'Percentage': (value_counts.values / len(df) * 100).round(2)
+    })
+    return value_counts, dist_df
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_chat_list(base_dir, project_id, chats_mtime_ns):
+    """
+    Chat metadata for the project home, loaded once per change to the
+    chats directory (every chat save atomically replaces a file in it,
+    which bumps the directory mtime)
+
+    Args:
+        base_dir: Data directory root
+        project_id: Project UUID
+        chats_mtime_ns: chats/ directory mtime (only used for caching)
+
+    Returns:
+        List of Chat objects (most recent first)
+    """
+    _, cm, _ = get_managers(base_dir)
+    return cm.list_chats(project_id)
+
+def list_chats_cached(project_id):
+    """List a project's chats through _cached_chat_list"""
+    base_dir = st.session_state.base_dir
+    chats_dir = os.path.join(get_project_directory(base_dir, project_id), "chats")
+    try:
+        mtime = os.stat(chats_dir).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return _cached_chat_list(base_dir, project_id, mtime)
+
+def open_chat(chat_id):
+    """Button callback - switch to a chat before the next rerun starts"""
+    st.session_state.active_chat_id = chat_id
+    st.session_state.view = 'chat'
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_file_bytes(path, mtime_ns):
+    """
+    Contents of a file shown or offered for download (dataset, plot or
+    modified CSV), read from disk once per file version instead of on
+    every rerun
+
+    Args:
+        path: File path
+        mtime_ns: File mtime (only used for caching)
+
+    Returns:
+        File bytes
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+def download_file_data(path):
+    """Download-button data for a file on disk (see _cached_file_bytes)"""
+    return _cached_file_bytes(path, os.stat(path).st_mtime_ns)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_csv_head(path, mtime_ns, n=5):
+    """First n rows of a CSV, parsed once per file version"""
+    return pd.read_csv(path, nrows=n)
+
+def file_mtime(path):
+    """
+    mtime of a generated file in one stat call
+
+    Returns:
+        mtime in nanoseconds, or None if the path is unset or missing
+    """
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
 # ============================================================================
 # SIDEBAR - Projects List
 # ============================================================================
@@ -356,7 +612,13 @@ def render_new_project_view():
     if uploaded_file is not None:
         # Show preview
         try:
-            df = pd.read_csv(uploaded_file)
+            # Parse once per uploaded file - every widget interaction reruns
+            # this script, and the same frame is handed to create_project
+            file_id = getattr(uploaded_file, 'file_id', uploaded_file.name)
+            if st.session_state.get('_upload_fid') != file_id:
+                st.session_state._upload_df = read_csv_fast(uploaded_file)
+                st.session_state._upload_fid = file_id
+            df = st.session_state._upload_df
 
             st.success(f"✓ File loaded: {len(df):,} rows × {len(df.columns)} columns")
 
@@ -386,6 +648,9 @@ def render_new_project_view():
                             )
 
                             if project:
+                                # Release the parsed upload
+                                st.session_state.pop('_upload_df', None)
+                                st.session_state.pop('_upload_fid', None)
                                 st.success(f"✓ Project '{project.name}' created!")
                                 st.session_state.active_project_id = project.id
                                 st.session_state.active_chat_id = project.active_chat_id
@@ -440,7 +705,7 @@ def render_project_home():
     st.markdown("")  # Spacing
 
     # Existing chats
-    chats = st.session_state.cm.list_chats(project.id)
+    chats = list_chats_cached(project.id)
 
     if chats:
         # Display in grid (3 columns)
@@ -462,10 +727,15 @@ def render_project_home():
                     </div>
                     """, unsafe_allow_html=True)
 
-                    if st.button("Continue", key=f"chat_{chat.id}", use_container_width=True):
-                        st.session_state.active_chat_id = chat.id
-                        st.session_state.view = 'chat'
-                        st.rerun()
+                    # Callback sets the view before the rerun the click
+                    # triggers, so no second st.rerun() pass is needed
+                    st.button(
+                        "Continue",
+                        key=f"chat_{chat.id}",
+                        use_container_width=True,
+                        on_click=open_chat,
+                        args=(chat.id,)
+                    )
     else:
         st.info("No chats yet. Start your first analysis!")
 
@@ -475,7 +745,11 @@ def render_project_home():
 
 @st.dialog("📊 Dataset Context", width="large")
 def show_data_context_modal():
-    """Show data context in a modal"""
+    """
+    Show data context in a modal
+    Dialogs rerun as fragments - widget interactions inside the modal rerun
+    only this function, not the whole app
+    """
 
     project = safe_get_project(st.session_state.active_project_id)
 
@@ -485,7 +759,9 @@ def show_data_context_modal():
 
     # Load dataframe
     try:
-        df = st.session_state.vm.load_current_dataframe(project.id)
+        base_dir = st.session_state.base_dir
+        version_key = get_data_version_key(project)
+        df = _cached_display_df(base_dir, project.id, version_key)
 
         # Overview
         st.markdown("### 📊 Dataset Overview")
@@ -497,18 +773,12 @@ def show_data_context_modal():
         # Columns info
         st.markdown("### 📋 Columns")
 
-        col_info = []
-        for col in df.columns:
-            dtype = str(df[col].dtype)
-            null_pct = (df[col].isnull().sum() / len(df) * 100)
-            col_info.append({
-                "Column": col,
-                "Type": dtype,
-                "Nulls": f"{null_pct:.1f}%"
-            })
+        col_info, low_cardinality_cols, missing_pct, numeric_count, text_count = _cached_column_profile(
+            base_dir, project.id, version_key
+        )
 
         st.dataframe(
-            pd.DataFrame(col_info),
+            col_info,
             use_container_width=True,
             hide_index=True
         )
@@ -518,25 +788,20 @@ def show_data_context_modal():
         # Value Distributions for Low-Cardinality Columns
         st.markdown("### 📊 Value Distributions")
 
-        low_cardinality_cols = [col for col in df.columns if df[col].nunique() <= 20 and df[col].nunique() > 1]
-
         if low_cardinality_cols:
             # Show distributions in tabs
             tabs = st.tabs([col[:20] for col in low_cardinality_cols[:10]])  # Limit to 10 tabs
 
             for i, col in enumerate(low_cardinality_cols[:10]):
                 with tabs[i]:
-                    value_counts = df[col].value_counts()
+                    value_counts, dist_df = _cached_value_distribution(
+                        base_dir, project.id, version_key, col
+                    )
 
                     # Show as bar chart
                     st.bar_chart(value_counts)
 
                     # Show as table with counts and percentages
-                    dist_df = pd.DataFrame({
-                        'Value': value_counts.index.astype(str),
-                        'Count': value_counts.values,
-                        'Percentage': (value_counts.values / len(df) * 100).round(2)
-                    })
                     st.dataframe(dist_df, use_container_width=True, hide_index=True)
         else:
             st.info("No low-cardinality columns found (columns with ≤20 unique values)")
@@ -551,18 +816,17 @@ def show_data_context_modal():
 
         # Statistics
         st.markdown("### 📝 Statistics")
-        numeric_cols = df.select_dtypes(include=['number']).columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
-
-        st.markdown(f"- Numeric columns: {len(numeric_cols)}")
-        st.markdown(f"- Categorical columns: {len(categorical_cols)}")
+        st.markdown(f"- Numeric columns: {numeric_count}")
+        st.markdown(f"- Categorical columns: {text_count}")
         st.markdown(f"- Low-cardinality columns (≤20 unique): {len(low_cardinality_cols)}")
-        st.markdown(f"- Missing values: {(df.isnull().sum().sum() / (len(df) * len(df.columns)) * 100):.1f}%")
+        st.markdown(f"- Missing values: {missing_pct:.1f}%")
 
         st.markdown("---")
 
         # Download button
-        csv = df.to_csv(index=False)
+        # current.csv is written with to_csv(index=False), so its bytes are
+        # exactly what re-serializing the DataFrame would produce
+        csv = download_file_data(get_current_csv_path(base_dir, project.id))
         st.download_button(
             label="📥 Download Full Dataset",
             data=csv,
@@ -578,11 +842,19 @@ def show_data_context_modal():
 # MESSAGE RENDERING - Output Type-Specific UI
 # ============================================================================
 
+@st.fragment
 def render_assistant_message(msg):
-    """Render assistant message with output type-specific UI"""
+    """
+    Render assistant message with output type-specific UI
+    Runs as a fragment, so a download click reruns only this message
+    """
 
     output_type = msg.output_type
 
+    # One stat per generated file - the mtimes key the cached reads below
+    plot_mtime = file_mtime(msg.plot_path)
+    data_mtime = file_mtime(msg.modified_dataframe_path)
+
     # Show explanation if available
     if msg.explanation:
         st.markdown(f"**📝 Explanation:**")
@@ -610,19 +882,19 @@ def render_assistant_message(msg):
                 st.code(msg.code, language="python")
 
         # Visualization
-        if msg.plot_path and os.path.exists(msg.plot_path):
+        if plot_mtime is not None:
+            plot_bytes = _cached_file_bytes(msg.plot_path, plot_mtime)
             st.markdown("**🎨 Visualization:**")
-            st.image(msg.plot_path, use_container_width=True)
+            st.image(plot_bytes, use_container_width=True)
 
             # Download button
-            with open(msg.plot_path, "rb") as file:
-                st.download_button(
-                    label="📥 Download PNG",
-                    data=file,
-                    file_name=os.path.basename(msg.plot_path),
-                    mime="image/png",
-                    key=f"download_plot_{msg.id}"
-                )
+            st.download_button(
+                label="📥 Download PNG",
+                data=plot_bytes,
+                file_name=os.path.basename(msg.plot_path),
+                mime="image/png",
+                key=f"download_plot_{msg.id}"
+            )
 
     # === MODIFICATION UI ===
     elif output_type == "modification":
@@ -645,21 +917,20 @@ def render_assistant_message(msg):
                          delta=f"{summary['cols_after'] - summary['cols_before']}")
 
         # Download modified data
-        if msg.modified_dataframe_path and os.path.exists(msg.modified_dataframe_path):
-            with open(msg.modified_dataframe_path, "rb") as file:
-                st.download_button(
-                    label="📥 Download CSV",
-                    data=file,
-                    file_name=os.path.basename(msg.modified_dataframe_path),
-                    mime="text/csv",
-                    key=f"download_csv_{msg.id}"
-                )
+        if data_mtime is not None:
+            st.download_button(
+                label="📥 Download CSV",
+                data=_cached_file_bytes(msg.modified_dataframe_path, data_mtime),
+                file_name=os.path.basename(msg.modified_dataframe_path),
+                mime="text/csv",
+                key=f"download_csv_{msg.id}"
+            )
 
             # Preview
             try:
-                df_preview = pd.read_csv(msg.modified_dataframe_path)
+                df_preview = _cached_csv_head(msg.modified_dataframe_path, data_mtime)
                 st.markdown("**Preview (first 5 rows):**")
-                st.dataframe(df_preview.head(), use_container_width=True)
+                st.dataframe(df_preview, use_container_width=True)
             except Exception as e:
                 st.error(f"Error loading preview: {e}")
 
@@ -675,24 +946,23 @@ def render_assistant_message(msg):
         if msg.output:
             st.text(msg.output)
 
-        if msg.plot_path and os.path.exists(msg.plot_path):
-            st.image(msg.plot_path)
-
-        if msg.modified_dataframe_path and os.path.exists(msg.modified_dataframe_path):
-            with open(msg.modified_dataframe_path, "rb") as file:
-                st.download_button(
-                    label="📥 Download File",
-                    data=file,
-                    file_name=os.path.basename(msg.modified_dataframe_path),
-                    mime="text/csv",
-                    key=f"download_{msg.id}"
-                )
+        if plot_mtime is not None:
+            st.image(_cached_file_bytes(msg.plot_path, plot_mtime))
+
+        if data_mtime is not None:
+            st.download_button(
+                label="📥 Download File",
+                data=_cached_file_bytes(msg.modified_dataframe_path, data_mtime),
+                file_name=os.path.basename(msg.modified_dataframe_path),
+                mime="text/csv",
+                key=f"download_{msg.id}"
+            )
 
 # ============================================================================
 # AI AGENT INITIALIZATION
 # ============================================================================
 
-def init_ai_agent_for_chat(project_id, chat_id):
+def init_ai_agent_for_chat(project, chat_id):
     """Initialize AI agent for the current chat session"""
 
     try:
@@ -709,13 +979,19 @@ def init_ai_agent_for_chat(project_id, chat_id):
                 base_dir=st.session_state.base_dir
             )
 
-        # Load dataframe and EDA context
-        df = st.session_state.vm.load_current_dataframe(project_id)
-        eda_context = generate_eda_context(df)
+        # Load dataframe and EDA context (cached per data version - each call
+        # returns a fresh copy, so the agent may modify its DataFrame)
+        base_dir = st.session_state.base_dir
+        version_key = get_data_version_key(project)
+        df = _cached_load_df(base_dir, project.id, version_key)
+        if df is None:
+            st.error("Project data not found")
+            return False
+        eda_context = _cached_eda_context(base_dir, project.id, version_key)
 
         # Start chat session
         success = st.session_state.agent.start_chat_session(
-            project_id,
+            project.id,
             chat_id,
             df,
             eda_context
@@ -731,6 +1007,19 @@ def init_ai_agent_for_chat(project_id, chat_id):
 # CHAT INTERFACE
 # ============================================================================
 
+# Messages rendered before "Show earlier messages" is switched on
+RECENT_MESSAGES = 20
+
+def render_chat_message(msg):
+    """Render one chat message in its chat bubble"""
+    if msg.role == "user":
+        with st.chat_message("user"):
+            st.markdown(msg.content)
+    else:
+        with st.chat_message("assistant"):
+            # Render based on output type
+            render_assistant_message(msg)
+
 def render_chat_interface():
     """Render chat interface"""
 
@@ -749,7 +1038,7 @@ def render_chat_interface():
        st.session_state.agent.current_chat_id != chat.id:
 
         with st.spinner("Initializing AI agent..."):
-            if not init_ai_agent_for_chat(project.id, chat.id):
+            if not init_ai_agent_for_chat(project, chat.id):
                 st.error("Failed to initialize AI agent. Please check your GEMINI_API_KEY.")
                 return
 
@@ -782,14 +1071,19 @@ def render_chat_interface():
         if not messages:
             st.info("No messages yet. Start by asking a question about your data!")
         else:
+            # Only the latest messages render by default - each one may carry
+            # a plot and a data preview, so long histories make every rerun slow
+            earlier_count = len(messages) - RECENT_MESSAGES
+            if earlier_count > 0:
+                show_earlier = st.toggle(
+                    f"Show {earlier_count} earlier message{'s' if earlier_count != 1 else ''}",
+                    key=f"show_earlier_{chat.id}"
+                )
+                if not show_earlier:
+                    messages = messages[-RECENT_MESSAGES:]
+
             for msg in messages:
-                if msg.role == "user":
-                    with st.chat_message("user"):
-                        st.markdown(msg.content)
-                else:
-                    with st.chat_message("assistant"):
-                        # Render based on output type
-                        render_assistant_message(msg)
+                render_chat_message(msg)
 
     # Input area
     st.markdown("---")
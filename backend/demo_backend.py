@@ -6,7 +6,6 @@ Run queries directly against the AI agent to verify Phase 1 & 2
 
 import os
 import sys
-import pandas as pd
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,7 +15,7 @@ from src.project_manager import ProjectManager
 from src.chat_manager import ChatManager
 from src.version_manager import VersionManager
 from src.ai_agent import AIAgent
-from src.eda_utils import generate_eda_context
+from src.utils import read_csv_fast
 
 
 def print_banner(text):
@@ -67,7 +66,7 @@ def load_user_data():
         sys.exit(1)
 
     try:
-        df = pd.read_csv(csv_path)
+        df = read_csv_fast(csv_path)
         return df, csv_path
     except Exception as e:
         print(f"\n❌ Error loading CSV: {e}")
@@ -115,7 +114,7 @@ def main():
 
     # Load dataframe and generate context
     df = vm.load_current_dataframe(project.id)
-    eda_context = generate_eda_context(df)
+    eda_context = pm.get_eda_context(project.id, df)
     print(f"   EDA context: {len(eda_context)} chars")
 
     # Initialize AI agent
@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for production
+
+Usage:
+    gunicorn -c gunicorn_conf.py api.main:app
+"""
+
+import os
+
+# Listen address
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# One Uvicorn worker unless WEB_CONCURRENCY says otherwise. Chat state is
+# per process: each worker builds its own AI agent (and Gemini session) for a
+# chat and appends its own history to {chat_id}.gemini.jsonl, and the locks
+# around message logs and chats_index.json are process-local. Only run more
+# workers behind a load balancer that routes each chat (project_id/chat_id
+# in the path) to the same worker. Memory also scales per worker - each has
+# its own DF_CACHE_MB DataFrame cache and up to MAX_ACTIVE_AGENTS agents,
+# each with a code worker subprocess holding a copy of its DataFrame.
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master and fork workers from it, so module-level
+# managers and imported libraries are shared copy-on-write. Per-process caches
+# (DataFrames, AI agents) still fill independently in each worker.
+preload_app = True
+
+# No `threads` setting - with an ASGI worker it does nothing; sync routes run
+# in Starlette's own threadpool
+timeout = 120
+keepalive = 5
@@ -3,13 +3,28 @@ Run script for AI Data Analyst API
 Starts the FastAPI server with uvicorn
 """
 
+import os
 import uvicorn
 
-if __name__ == "__main__":
+
+def serve() -> None:
+    """Start uvicorn for api.main:app (shared by this script and api/main.py)"""
+    # "auto" uses uvloop/httptools when installed (uvloop is not available on
+    # Windows) and falls back to asyncio/h11 otherwise.
+    # Set API_RELOAD=true for development (reload forces a single worker).
+    # One worker by default - see gunicorn_conf.py before raising WEB_CONCURRENCY.
+    reload = os.getenv("API_RELOAD", "false").lower() == "true"
     uvicorn.run(
         "api.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="auto",
+        http="auto",
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", "1")),
+        reload=reload,
         log_level="info"
     )
+
+
+if __name__ == "__main__":
+    serve()
@@ -4,123 +4,161 @@ Handles Gemini integration, code generation, and execution
 """
 
 import os
-import io
-import sys
+import re
 import json
-import uuid
-import shutil
+import hashlib
+import tempfile
+import threading
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, Any
+import anyio.to_thread
+import numpy as np
+import orjson
 import pandas as pd
-import matplotlib.pyplot as plt
 import google.generativeai as genai
 
 from .chat_manager import ChatManager
+from .code_worker import CodeWorker, NUMBA_AVAILABLE
 from .models import Message
 
-
-class AIAgent:
+# Dataset metadata questions answered with fixed code, matched against the
+# whole normalized query so e.g. "shape of the salary distribution" still
+# goes to Gemini
+_DATASET = r"(?: (?:of|in) (?:the|this|my) (?:dataset|data|dataframe|table))?"
+_DIRECT_ANSWERS = [
+    (
+        re.compile(r"(?:what are the |show(?: me)? the |list(?: the| all)?(?: the)? |show(?: me)? )?"
+                   r"(?:columns|column names|schema|dtypes|data types)" + _DATASET + r"[?.!]*"),
+        {
+            "output_type": "exploratory",
+            "code": "print(df.dtypes.to_string())",
+            "explanation": "Lists every column in the dataset with its data type."
+        }
+    ),
+    (
+        re.compile(r"(?:what is the |show(?: me)? the )?(?:shape|dimensions)" + _DATASET + r"[?.!]*"
+                   r"|how many rows(?: and columns)?(?: are there)?" + _DATASET + r"[?.!]*"),
+        {
+            "output_type": "exploratory",
+            "code": 'print(f"Rows: {df.shape[0]:,}\\nColumns: {df.shape[1]:,}")',
+            "explanation": "Shows the number of rows and columns in the dataset."
+        }
+    ),
+    (
+        re.compile(r"(?:show(?: me)? )?(?:the )?(?:head|first (?:5|five) rows)" + _DATASET + r"[?.!]*"),
+        {
+            "output_type": "exploratory",
+            "code": "print(df.head().to_string())",
+            "explanation": "Shows the first 5 rows of the dataset."
+        }
+    ),
+]
+
+# Fields of a (possibly still streaming) JSON reply - a string value only
+# matches once its closing quote has arrived
+_OUTPUT_TYPE_RE = re.compile(r'"output_type"\s*:\s*"(exploratory|visualization|modification)"')
+_CODE_FIELD_RE = re.compile(r'"code"\s*:\s*"((?:[^"\\]|\\.)*)"', re.DOTALL)
+
+# Numbers and quoted literals of a query - a near-match must have the same ones
+# ("top 5" and "top 10" embed almost identically)
+_QUERY_LITERAL_RE = re.compile(r"\"[^\"]*\"|`[^`]*`|(?<!\w)'[^']*'(?!\w)|\d+(?:[.,]\d+)*")
+
+
+class _EmbeddingBatcher:
     """
-    AI agent that handles natural language queries and code generation
-    Integrates with Gemini API and manages chat context
+    Coalesces concurrent embedding requests into batched embed_content calls
+    A caller that finds no call in flight sends right away; callers arriving
+    meanwhile queue up and all go out together in the next call
     """
 
-    def __init__(
-        self,
-        api_key: str,
-        base_dir: str = "data",
-        model_name: str = "gemini-2.0-flash-exp"
-    ):
-        """
-        Initialize AI agent
-
-        Args:
-            api_key: Google Gemini API key
-            base_dir: Base directory for data storage
-            model_name: Gemini model to use
-        """
-        self.base_dir = base_dir
-        self.chat_manager = ChatManager(base_dir)
-        self.model_name = model_name
-
-        # Configure Gemini
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(model_name)
+    # Texts per request - the API's batch limit
+    MAX_BATCH = 100
 
-        # Active chat session
-        self.active_chat_session = None
-        self.current_project_id = None
-        self.current_chat_id = None
-        self.current_dataframe = None
-        self.dataset_context = None
-
-    # ===== Session Management =====
+    def __init__(self, model: str):
+        self.model = model
+        self._queue: list[tuple[str, Future]] = []
+        self._queue_lock = threading.Lock()
+        self._send_lock = threading.Lock()
 
-    def start_chat_session(
-        self,
-        project_id: str,
-        chat_id: str,
-        dataframe: pd.DataFrame,
-        dataset_context: str,
-        business_context: Optional[str] = None
-    ) -> bool:
+    def embed(self, text: str) -> list:
         """
-        Start or resume a chat session
-
-        Args:
-            project_id: Project UUID
-            chat_id: Chat UUID
-            dataframe: Current DataFrame
-            dataset_context: EDA context string
-            business_context: Optional business context
+        Embed one text, sharing the API round-trip with concurrent callers
 
         Returns:
-            True if successful, False otherwise
+            Embedding values
+
+        Raises:
+            Exception: Whatever the embedding call raised
         """
+        future = Future()
+        with self._queue_lock:
+            self._queue.append((text, future))
+
+        with self._send_lock:
+            # An earlier caller may already have sent this text in its batch
+            while not future.done():
+                with self._queue_lock:
+                    batch = self._queue[:self.MAX_BATCH]
+                    del self._queue[:self.MAX_BATCH]
+                self._send(batch)
+
+        return future.result()
+
+    def _send(self, batch: list[tuple[str, Future]]) -> None:
+        """Embed a batch with one API call and resolve its futures"""
         try:
-            self.current_project_id = project_id
-            self.current_chat_id = chat_id
-            self.current_dataframe = dataframe
-            self.dataset_context = dataset_context
+            result = genai.embed_content(model=self.model, content=[text for text, _ in batch])
+            for (_, future), values in zip(batch, result["embedding"]):
+                future.set_result(values)
+            error = RuntimeError("Embedding missing from batch response")
+        except Exception as e:
+            error = e
 
-            # Build system instruction
-            system_instruction = self._build_system_instruction(
-                dataset_context,
-                business_context
-            )
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
 
-            # Start fresh chat session
-            self.active_chat_session = self.model.start_chat()
 
-            # Send initial system message with instructions
-            initial_msg = f"{system_instruction}\n\nDataset loaded and ready for analysis."
-            self.active_chat_session.send_message(initial_msg)
+class AIAgent:
+    """
+    AI agent that handles natural language queries and code generation
+    Integrates with Gemini API and manages chat context
+    """
 
-            return True
+    # Response cache: answers reused for repeat / near-repeat queries
+    RESPONSE_CACHE_NAME = "sem_cache"
+    EMBEDDING_MODEL = "models/text-embedding-004"
+    SEMANTIC_CACHE_THRESHOLD = 0.95
+    SEMANTIC_CACHE_MAX_ENTRIES = 1000
+    # Shared by all agents, so concurrent sessions batch their embeddings
+    _embedder = _EmbeddingBatcher(EMBEDDING_MODEL)
 
-        except Exception as e:
-            print(f"Error starting chat session: {e}")
-            traceback.print_exc()
-            return False
+    # Replies are raw JSON (no markdown fences). No response_schema: the API
+    # emits schema properties alphabetically, which would put output_type
+    # after code and explanation and defeat executing code mid-stream
+    GENERATION_CONFIG = {"response_mime_type": "application/json"}
 
-    def _build_system_instruction(
-        self,
-        dataset_context: str,
-        business_context: Optional[str] = None
-    ) -> str:
-        """Build system instruction for Gemini with JSON response format"""
-        instruction = f"""You are an expert data analyst assistant. You help users analyze CSV data by generating Python code using pandas.
+    # Appended to the static instruction when the worker can JIT custom functions
+    _NUMBA_INSTRUCTION = """
 
-DATASET CONTEXT:
-{dataset_context}
+NUMBA ENGINE:
+- When a custom function is passed to .rolling().apply() or .expanding().apply() on NUMERIC columns, pass engine='numba', raw=True
+- The function receives a NumPy array - use only NumPy operations inside it (no pandas methods, strings or dicts)
+- Prefer built-in methods (.rolling().mean(), .groupby().transform('sum')) over custom functions whenever one exists"""
+
+    # Static part of the system instruction - identical for every session, so
+    # it leads the prompt and the dataset-specific context follows it
+    _STATIC_INSTRUCTION = """You are an expert data analyst assistant. You help users analyze CSV data by generating Python code using pandas.
 
 RESPONSE FORMAT (CRITICAL):
 You MUST respond with valid JSON in this exact structure:
-{{
+{
   "output_type": "exploratory" | "visualization" | "modification",
   "code": "Python code here",
   "explanation": "Brief explanation of what the code does"
-}}
+}
 
 OUTPUT TYPES:
 1. **exploratory**: Answering questions, showing data, calculating metrics, statistical analysis
@@ -185,7 +223,7 @@ CODE QUALITY BEST PRACTICES:
 - Handle null values appropriately: .dropna(), .fillna(), .isna()
 - Use descriptive variable names
 - Keep code clean and readable
-- Reference the dataset context above for column names, types, and ranges
+- Reference the DATASET CONTEXT below for column names, types, and ranges
 - For numeric columns, use the provided range information to validate filters
 - For categorical columns, use the provided top values to guide analysis
 
@@ -221,14 +259,169 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
   * Check if result is empty before printing: if not result.empty:
   * Replace "No results found" messages instead of printing NaN tables
 - Use descriptive labels: Instead of just printing numbers, add context
-  * GOOD: print(f"Total users with cars: {{count}} ({{percentage:.1f}}%)")
+  * GOOD: print(f"Total users with cars: {count} ({percentage:.1f}%)")
   * BAD: print(count)
 - For correlation analysis specifically:
   * Filter out NaN values before printing
   * Only show correlations that meet the threshold
   * If no strong correlations found, say so clearly - don't print empty tables
-  * Consider using visualization (heatmap) for correlation matrices
-"""
+  * Consider using visualization (heatmap) for correlation matrices"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_dir: str = "data",
+        model_name: str = "gemini-2.0-flash-exp"
+    ):
+        """
+        Initialize AI agent
+
+        Args:
+            api_key: Google Gemini API key
+            base_dir: Base directory for data storage
+            model_name: Gemini model to use
+        """
+        self.base_dir = base_dir
+        self.chat_manager = ChatManager(base_dir)
+        self.worker = CodeWorker(base_dir)
+        self.model_name = model_name
+
+        # Configure Gemini (model is built per session with its system instruction)
+        genai.configure(api_key=api_key)
+        self.model = None
+
+        # Active chat session
+        self.active_chat_session = None
+        self.current_project_id = None
+        self.current_chat_id = None
+        self.current_dataframe = None
+        self.dataset_context = None
+        self.system_instruction = None
+        self._instruction_hash = None
+        # Gemini history entries already written to the chat's history log
+        self._history_cursor = 0
+        # ((normalized query, arrow_output), answer, execution result) of the last successful turn
+        self._last_turn = None
+        # Whether the query being processed wants Arrow output for modifications
+        self._arrow_output = False
+        # One query (or close) at a time - process_query_async runs queries off the event loop
+        self._query_lock = threading.Lock()
+
+        # Response cache (unit-norm query embedding, payload), persisted in base_dir
+        self._sem_cache: list[tuple[np.ndarray, dict]] = self._load_sem_cache()
+        self._sem_exact: dict[tuple[str, str], dict] = {
+            (payload["context_hash"], payload["query"]): payload
+            for _, payload in self._sem_cache
+        }
+        self._sem_index = None
+        self._sem_evicted: set[tuple[str, str]] = set()
+        self._sem_dirty = False
+
+    # ===== Session Management =====
+
+    def start_chat_session(
+        self,
+        project_id: str,
+        chat_id: str,
+        dataframe: pd.DataFrame,
+        dataset_context: str,
+        business_context: Optional[str] = None
+    ) -> bool:
+        """
+        Start or resume a chat session
+        Re-entering the chat that is already active with the same context only
+        swaps in the DataFrame - no new Gemini session
+
+        Args:
+            project_id: Project UUID
+            chat_id: Chat UUID
+            dataframe: Current DataFrame
+            dataset_context: EDA context string
+            business_context: Optional business context
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            # System instruction and model are shared by every chat on the same context
+            system_instruction, instruction_hash, model = self._session_template(
+                self.model_name,
+                dataset_context,
+                business_context
+            )
+
+            if (self.active_chat_session is not None
+                    and self.current_project_id == project_id
+                    and self.current_chat_id == chat_id
+                    and self.system_instruction == system_instruction):
+                self.current_dataframe = dataframe
+                self.worker.load_dataframe(dataframe)
+                self._last_turn = None
+                return True
+
+            self.current_project_id = project_id
+            self.current_chat_id = chat_id
+            self.current_dataframe = dataframe
+            self.dataset_context = dataset_context
+            self.system_instruction = None
+            self._instruction_hash = None
+
+            # Worker starts up and loads the DataFrame while Gemini is set up
+            self.worker.load_dataframe(dataframe)
+
+            # Start fresh chat session - the instruction goes out as the model's
+            # system instruction with each query, so no priming round-trip
+            self.model = model
+            self.active_chat_session = self.model.start_chat()
+            self._history_cursor = 0
+            self._last_turn = None
+
+            # Only a fully set up session can be reused by the check above
+            self.system_instruction = system_instruction
+            self._instruction_hash = instruction_hash
+
+            return True
+
+        except Exception as e:
+            print(f"Error starting chat session: {e}")
+            traceback.print_exc()
+            return False
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _session_template(
+        cls,
+        model_name: str,
+        dataset_context: str,
+        business_context: Optional[str] = None
+    ) -> tuple[str, str, genai.GenerativeModel]:
+        """
+        System instruction, its hash and a model configured with it, built once
+        per context - chats on the same dataset version share all three (each
+        gets its own ChatSession from start_chat)
+
+        Returns:
+            (system instruction, sha256 hex digest of it, GenerativeModel)
+        """
+        instruction = cls._build_system_instruction(dataset_context, business_context)
+        model = genai.GenerativeModel(
+            model_name,
+            system_instruction=instruction,
+            generation_config=cls.GENERATION_CONFIG
+        )
+        return instruction, hashlib.sha256(instruction.encode("utf-8")).hexdigest(), model
+
+    @classmethod
+    def _build_system_instruction(
+        cls,
+        dataset_context: str,
+        business_context: Optional[str] = None
+    ) -> str:
+        """Build system instruction for Gemini with JSON response format"""
+        instruction = cls._STATIC_INSTRUCTION
+        if NUMBA_AVAILABLE:
+            instruction += cls._NUMBA_INSTRUCTION
+        instruction += f"\n\nDATASET CONTEXT:\n{dataset_context}"
 
         if business_context:
             instruction += f"\n\nBUSINESS CONTEXT:\n{business_context}"
@@ -237,10 +430,34 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
 
     # ===== Query Processing =====
 
+    async def process_query_async(
+        self,
+        user_query: str,
+        save_to_chat: bool = True,
+        arrow_output: bool = False
+    ) -> dict:
+        """
+        Process user query in a worker thread, without blocking the event loop
+        Gemini's network waits and code execution release the GIL, so queries
+        for different chats overlap; queries for the same agent run in order.
+        Runs on AnyIO's threadpool, so it is bounded by the same limiter
+        (ANYIO_THREADS) as the API's sync routes
+
+        Args:
+            user_query: User's natural language query
+            save_to_chat: Whether to save to chat history
+            arrow_output: See process_query
+
+        Returns:
+            Dict with response data (code, output, result, etc.)
+        """
+        return await anyio.to_thread.run_sync(self.process_query, user_query, save_to_chat, arrow_output)
+
     def process_query(
         self,
         user_query: str,
-        save_to_chat: bool = True
+        save_to_chat: bool = True,
+        arrow_output: bool = False
     ) -> dict:
         """
         Process user query and generate response
@@ -248,10 +465,17 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
         Args:
             user_query: User's natural language query
             save_to_chat: Whether to save to chat history
+            arrow_output: Also return a modified dataset as an Arrow IPC
+                stream file (modified_arrow_path), preserving dtypes
 
         Returns:
             Dict with response data (code, output, result, etc.)
         """
+        with self._query_lock:
+            return self._process_query(user_query, save_to_chat, arrow_output)
+
+    def _process_query(self, user_query: str, save_to_chat: bool, arrow_output: bool) -> dict:
+        """process_query body - called with _query_lock held"""
         try:
             if self.active_chat_session is None:
                 return {
@@ -259,6 +483,12 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
                     "error": "No active chat session"
                 }
 
+            if not user_query or not user_query.strip():
+                return {
+                    "success": False,
+                    "error": "Query is empty"
+                }
+
             # Save user message if requested
             if save_to_chat:
                 self.chat_manager.add_user_message(
@@ -267,43 +497,80 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
                     user_query
                 )
 
-            # Send query to Gemini
-            print(f"[DEBUG] Sending query to Gemini: {user_query}")
-            response = self.active_chat_session.send_message(user_query)
-            ai_response = response.text
-            print(f"[DEBUG] Gemini response (first 500 chars): {ai_response[:500]}")
-
-            # Parse JSON response from Gemini (with markdown stripping)
-            try:
-                # Strip markdown code blocks if present (FIX for previous issue)
-                clean_response = ai_response.strip()
-                if clean_response.startswith("```json"):
-                    clean_response = clean_response[7:]  # Remove ```json
-                elif clean_response.startswith("```"):
-                    clean_response = clean_response[3:]  # Remove ```
-
-                if clean_response.endswith("```"):
-                    clean_response = clean_response[:-3]  # Remove trailing ```
-
-                clean_response = clean_response.strip()
-
-                # Try to parse as JSON
-                response_json = json.loads(clean_response)
-                output_type = response_json.get("output_type", "exploratory")
-                code = response_json.get("code", "")
-                explanation = response_json.get("explanation", "")
-                print(f"[DEBUG] Successfully parsed JSON - output_type: {output_type}")
-            except json.JSONDecodeError as e:
-                # Fallback: if JSON parsing fails, try to extract from markdown
-                print(f"[WARNING] Gemini didn't return valid JSON: {e}")
-                print(f"[DEBUG] Response after stripping: {clean_response[:200]}")
-                return {
-                    "success": False,
-                    "error": f"Failed to parse Gemini response as JSON: {e}\n\nResponse: {ai_response[:500]}"
-                }
-
-            # Execute code
-            execution_result = self._execute_code(code, output_type)
+            normalized_query = self._normalize_query(user_query)
+            turn_key = (normalized_query, arrow_output)
+            self._arrow_output = arrow_output
+            execution_result = None
+            query_vector = None
+
+            if self._last_turn is not None and self._last_turn[0] == turn_key:
+                # Same question as the previous turn - nothing has run since
+                print(f"[DEBUG] Repeat of the previous query: {user_query}")
+                _, answer, execution_result = self._last_turn
+                output_type = answer["output_type"]
+                code = answer["code"]
+                explanation = answer["explanation"]
+                self._append_cached_turn(user_query, answer)
+            else:
+                # Metadata questions are answered locally and repeat / near-repeat
+                # queries reuse a cached answer - no Gemini round-trip either way,
+                # and the code still runs against the current df
+                direct = self._direct_answer(normalized_query)
+                if direct is not None:
+                    cached = direct
+                elif self._is_first_turn():
+                    cached, query_vector = self._lookup_cached_response(user_query)
+                else:
+                    # Follow-ups depend on the conversation - not cached
+                    cached = None
+                if cached is not None:
+                    print(f"[DEBUG] Answering without Gemini: {user_query}")
+                    output_type = cached["output_type"]
+                    code = cached["code"]
+                    explanation = cached["explanation"]
+                    execution_result = self._execute_code(code, output_type)
+                    if execution_result["success"]:
+                        self._append_cached_turn(user_query, cached)
+                    else:
+                        # Stale answer - drop it and ask Gemini instead
+                        if cached is not direct:
+                            self._evict_cached_response(cached)
+                        execution_result = None
+
+            if execution_result is None:
+                # Send query to Gemini (code starts running while the reply streams)
+                print(f"[DEBUG] Sending query to Gemini: {user_query}")
+                ai_response, early_run = self._stream_response(user_query)
+                print(f"[DEBUG] Gemini response (first 500 chars): {ai_response[:500]}")
+
+                # Parse JSON response from Gemini (JSON mode - no markdown fences)
+                try:
+                    response_json = orjson.loads(ai_response)
+                    output_type = response_json.get("output_type", "exploratory")
+                    code = response_json.get("code", "")
+                    explanation = response_json.get("explanation", "")
+                    print(f"[DEBUG] Successfully parsed JSON - output_type: {output_type}")
+                except (orjson.JSONDecodeError, AttributeError) as e:
+                    # Truncated reply (e.g. token limit) or JSON that isn't an object
+                    print(f"[WARNING] Gemini didn't return a valid JSON object: {e}")
+                    if early_run is not None:
+                        self._discard_early_run()
+                    return {
+                        "success": False,
+                        "error": f"Failed to parse Gemini response as JSON: {e}\n\nResponse: {ai_response[:500]}"
+                    }
+
+                # Execute code (unless the early run already executed this code)
+                if early_run is not None and early_run[:2] == (output_type, code):
+                    execution_result = early_run[2]
+                else:
+                    if early_run is not None:
+                        self._discard_early_run()
+                    execution_result = self._execute_code(code, output_type)
+                if execution_result["success"]:
+                    self._store_cached_response(
+                        user_query, query_vector, output_type, code, explanation
+                    )
 
             # Build response dict
             response_data = {
@@ -314,11 +581,19 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
                 "result": execution_result.get("result"),
                 "plot_path": execution_result.get("plot_path"),
                 "modified_dataframe_path": execution_result.get("modified_dataframe_path"),
+                "modified_arrow_path": execution_result.get("modified_arrow_path"),
                 "modification_summary": execution_result.get("modification_summary"),
                 "error": execution_result.get("error"),
                 "explanation": explanation
             }
 
+            # Remember the turn so an immediate repeat can be answered as-is
+            self._last_turn = (turn_key, {
+                "output_type": output_type,
+                "code": code,
+                "explanation": explanation
+            }, execution_result) if response_data["success"] else None
+
             # Save assistant message if requested and successful
             if save_to_chat and response_data["success"]:
                 self.chat_manager.add_assistant_message(
@@ -338,6 +613,9 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
                 # Update Gemini history in storage
                 self._save_gemini_history()
 
+                # The turn is finished - write its messages out as one batch
+                self.chat_manager.flush_messages(self.current_project_id, self.current_chat_id)
+
             return response_data
 
         except Exception as e:
@@ -348,131 +626,336 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
                 "error": error_msg
             }
 
-    def _execute_code(self, code: str, output_type: str) -> dict:
-        """Execute Python code safely"""
-        try:
-            # Debug logging
-            print(f"[DEBUG] Executing code (output_type={output_type})")
-            print(f"[DEBUG] DataFrame shape: {self.current_dataframe.shape if self.current_dataframe is not None else 'None'}")
-
-            # Prepare execution environment
-            exec_globals = {
-                'df': self.current_dataframe,
-                'pd': pd,
-                'plt': plt,
-                'np': __import__('numpy'),
-                'sns': __import__('seaborn')
-            }
-
-            # Capture stdout
-            old_stdout = sys.stdout
-            sys.stdout = captured_output = io.StringIO()
-
-            # Execute code
-            exec(code, exec_globals)
-
-            # Restore stdout
-            sys.stdout = old_stdout
-            output = captured_output.getvalue()
-
-            # Process result based on output type
-            result_data = {
-                "success": True,
-                "output": output
-            }
-
-            if output_type == "visualization":
-                # Check if plot was saved
-                plot_path = os.path.join(self.base_dir, "plots", f"plot_{self.current_chat_id}.png")
-                if os.path.exists("plot.png"):
-                    # Move plot to proper location
-                    os.makedirs(os.path.dirname(plot_path), exist_ok=True)
-                    shutil.move("plot.png", plot_path)
-                    result_data["plot_path"] = plot_path
-                else:
-                    result_data["success"] = False
-                    result_data["error"] = "Code executed but no plot was saved. Make sure to use plt.savefig('plot.png')"
-
-            elif output_type == "modification":
-                # Check if 'result' variable exists
-                if 'result' in exec_globals:
-                    modified_df = exec_globals['result']
-
-                    # Validate it's a DataFrame
-                    if isinstance(modified_df, pd.DataFrame):
-                        print(f"[DEBUG] Modified DataFrame shape: {modified_df.shape}")
-                        print(f"[DEBUG] Modified DataFrame columns: {list(modified_df.columns)}")
-
-                        # Save modified DataFrame to temp location
-                        temp_dir = os.path.join(self.base_dir, "temp_modifications")
-                        os.makedirs(temp_dir, exist_ok=True)
-
-                        temp_filename = f"{self.current_chat_id}_{uuid.uuid4().hex[:8]}.csv"
-                        temp_path = os.path.join(temp_dir, temp_filename)
-
-                        modified_df.to_csv(temp_path, index=False)
-                        result_data["modified_dataframe_path"] = temp_path
-
-                        # Generate modification summary (matching frontend expectations)
-                        preview_data = modified_df.head(10).to_dict('records')
-                        result_data["modification_summary"] = {
-                            "before_rows": len(self.current_dataframe),
-                            "after_rows": len(modified_df),
-                            "before_columns": len(self.current_dataframe.columns),
-                            "after_columns": len(modified_df.columns),
-                            "preview": preview_data,
-                            "new_columns": list(set(modified_df.columns) - set(self.current_dataframe.columns)),
-                            "removed_columns": list(set(self.current_dataframe.columns) - set(modified_df.columns))
-                        }
-                        print(f"[DEBUG] Modification summary: rows {result_data['modification_summary']['before_rows']} → {result_data['modification_summary']['after_rows']}, preview rows: {len(preview_data)}")
-                    else:
-                        result_data["success"] = False
-                        result_data["error"] = f"'result' variable is not a DataFrame (type: {type(modified_df).__name__})"
-                else:
-                    result_data["success"] = False
-                    result_data["error"] = "Modification query must assign output to 'result' variable"
+    def _stream_response(self, user_query: str) -> tuple[str, Optional[tuple[str, str, dict]]]:
+        """
+        Send a query to Gemini with a streamed reply
+        The reply lists output_type and code before the explanation, so the code
+        is handed to the worker as soon as its string closes, overlapping
+        execution with the rest of the generation
 
-            elif output_type == "exploratory":
-                # Just use the printed output
-                result_data["result"] = output
+        Args:
+            user_query: User's natural language query
 
-            return result_data
+        Returns:
+            (full response text, (output_type, code, execution result) or None
+            if the fields could not be picked out before the stream ended) -
+            the caller discards the early run if the final reply doesn't match
+        """
+        ai_response = ""
+        early_fields = None
+        future = None
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                for chunk in self.active_chat_session.send_message(user_query, stream=True):
+                    ai_response += chunk.text
+                    if future is None:
+                        early_fields = self._extract_early_fields(ai_response)
+                        if early_fields is not None:
+                            future = executor.submit(self._execute_code, early_fields[1], early_fields[0])
+
+                if future is None:
+                    return ai_response, None
+                return ai_response, (*early_fields, future.result())
+        except Exception:
+            # The stream broke after the code already ran - undo its changes to df
+            if future is not None:
+                self._discard_early_run()
+            raise
+
+    def _discard_early_run(self):
+        """
+        Reload the worker's DataFrame after an early run whose code isn't the
+        final answer (reply changed, failed to parse or never finished) - the
+        code may have modified df in place
+        """
+        print("[DEBUG] Discarding early execution - reloading the DataFrame")
+        self.worker.load_dataframe(self.current_dataframe)
+
+    @staticmethod
+    def _extract_early_fields(partial_response: str) -> Optional[tuple[str, str]]:
+        """Pick (output_type, code) out of a partial JSON reply once both are complete"""
+        output_type = _OUTPUT_TYPE_RE.search(partial_response)
+        if output_type is None:
+            return None
+        code = _CODE_FIELD_RE.search(partial_response)
+        if code is None:
+            return None
+        try:
+            return output_type.group(1), json.loads(f'"{code.group(1)}"')
+        except json.JSONDecodeError:
+            return None
 
-        except Exception as e:
-            sys.stdout = old_stdout
-            error_msg = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
-            return {
-                "success": False,
-                "error": error_msg
-            }
+    def _execute_code(self, code: str, output_type: str) -> dict:
+        """Execute Python code in the agent's worker process"""
+        return self.worker.execute(code, output_type, self.current_chat_id, self._arrow_output)
 
     def _save_gemini_history(self):
         """
-        Save current Gemini chat history in serializable format
-        Extracts role and text from Gemini's Content objects
+        Save new Gemini chat history entries in serializable format
+        Extracts role and text from Gemini's Content objects; only the turns
+        added since the last save are appended to the chat's history log
         """
         if not self.active_chat_session or not self.current_project_id or not self.current_chat_id:
             return
 
         try:
-            # Serialize Gemini history to JSON-safe format
+            history = self.active_chat_session.history
+            if len(history) <= self._history_cursor:
+                return
+
+            # Serialize new Gemini history entries to JSON-safe format
             serializable_history = []
-            for msg in self.active_chat_session.history:
+            for msg in history[self._history_cursor:]:
                 serializable_history.append({
                     "role": msg.role,
                     "parts": [{"text": part.text} for part in msg.parts]
                 })
 
-            # Save to chat manager
-            self.chat_manager.update_gemini_history(
+            # Append to chat manager (the first save of a session replaces the log)
+            if self.chat_manager.append_gemini_history(
                 self.current_project_id,
                 self.current_chat_id,
-                serializable_history
-            )
+                serializable_history,
+                new_session=self._history_cursor == 0
+            ):
+                self._history_cursor = len(history)
         except Exception as e:
             print(f"Error saving Gemini history: {e}")
             traceback.print_exc()
 
+    # ===== Response Cache =====
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Case- and whitespace-insensitive form of a query (exact-match key)"""
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def _direct_answer(normalized_query: str) -> Optional[dict]:
+        """Fixed answer for a dataset metadata question, or None"""
+        for pattern, answer in _DIRECT_ANSWERS:
+            if pattern.fullmatch(normalized_query):
+                return answer
+        return None
+
+    def _is_first_turn(self) -> bool:
+        """
+        Whether the Gemini session has no prior turns - only then is a query's
+        answer independent of the conversation, so only then is the response
+        cache used (which also skips the embedding round-trip for follow-ups)
+        """
+        try:
+            return not self.active_chat_session.history
+        except Exception:
+            return False
+
+    @staticmethod
+    def _query_literals(normalized_query: str) -> list[str]:
+        """Numbers and quoted literals of a normalized query, in order"""
+        return _QUERY_LITERAL_RE.findall(normalized_query)
+
+    def _context_hash(self) -> str:
+        """Hash of the active system instruction (dataset + business context)"""
+        if self._instruction_hash is None:
+            self._instruction_hash = hashlib.sha256((self.system_instruction or "").encode("utf-8")).hexdigest()
+        return self._instruction_hash
+
+    def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        """
+        Embed a query for semantic lookup
+
+        Returns:
+            L2-normalized float32 vector, or None if embedding failed
+        """
+        try:
+            vector = np.asarray(self._embedder.embed(query), dtype=np.float32)
+        except Exception as e:
+            print(f"Error embedding query for response cache: {e}")
+            return None
+
+        norm = np.linalg.norm(vector) if vector.ndim == 1 else 0.0
+        if not norm:
+            return None
+        return vector / norm
+
+    def _get_sem_index(self) -> tuple[np.ndarray, np.ndarray]:
+        """Stacked (N, d) embedding matrix and matching context hashes, built on demand"""
+        if self._sem_index is None:
+            self._sem_index = (
+                np.vstack([vector for vector, _ in self._sem_cache]),
+                np.array([payload["context_hash"] for _, payload in self._sem_cache])
+            )
+        return self._sem_index
+
+    def _lookup_cached_response(self, user_query: str) -> tuple[Optional[dict], Optional[np.ndarray]]:
+        """
+        Find a cached answer for a query asked before on the same context
+        A near-match (cosine similarity above the threshold) must also have the
+        same numbers and quoted literals as the query
+
+        Args:
+            user_query: User's natural language query
+
+        Returns:
+            (cached payload or None, query embedding or None) - the embedding
+            is handed back so a miss can be stored without embedding twice
+        """
+        context_hash = self._context_hash()
+        normalized_query = self._normalize_query(user_query)
+
+        # Exact fast path - no embedding round-trip
+        cached = self._sem_exact.get((context_hash, normalized_query))
+        if cached is not None:
+            return cached, None
+
+        vector = self._embed_query(user_query)
+        if vector is None or not self._sem_cache:
+            return None, vector
+
+        matrix, context_hashes = self._get_sem_index()
+        if matrix.shape[1] != vector.shape[0]:
+            return None, vector
+
+        # Cosine similarity against every cached query in one matrix product
+        sims = matrix @ vector
+        sims[context_hashes != context_hash] = -1.0
+        candidates = np.flatnonzero(sims > self.SEMANTIC_CACHE_THRESHOLD)
+        literals = self._query_literals(normalized_query)
+        for index in candidates[np.argsort(-sims[candidates])]:
+            payload = self._sem_cache[index][1]
+            if self._query_literals(payload["query"]) == literals:
+                return payload, vector
+
+        return None, vector
+
+    def _store_cached_response(
+        self,
+        user_query: str,
+        vector: Optional[np.ndarray],
+        output_type: str,
+        code: str,
+        explanation: str
+    ):
+        """Cache a successfully executed Gemini answer (skipped if the query has no embedding)"""
+        if vector is None:
+            return
+        if self._sem_cache and self._sem_cache[0][0].shape != vector.shape:
+            return
+
+        key = (self._context_hash(), self._normalize_query(user_query))
+        if key in self._sem_exact:
+            self._evict_cached_response(self._sem_exact[key])
+
+        payload = {
+            "context_hash": key[0],
+            "query": key[1],
+            "output_type": output_type,
+            "code": code,
+            "explanation": explanation
+        }
+        self._sem_cache.append((vector, payload))
+        self._sem_exact[key] = payload
+        self._sem_evicted.discard(key)
+
+        # Keep the most recent entries
+        for _, old in self._sem_cache[:-self.SEMANTIC_CACHE_MAX_ENTRIES]:
+            self._sem_exact.pop((old["context_hash"], old["query"]), None)
+        del self._sem_cache[:-self.SEMANTIC_CACHE_MAX_ENTRIES]
+
+        self._sem_index = None
+        self._sem_dirty = True
+
+    def _evict_cached_response(self, payload: dict):
+        """Drop a cached answer (e.g. its code no longer runs)"""
+        key = (payload["context_hash"], payload["query"])
+        self._sem_cache = [entry for entry in self._sem_cache if entry[1] is not payload]
+        if self._sem_exact.get(key) is payload:
+            del self._sem_exact[key]
+        self._sem_evicted.add(key)
+        self._sem_index = None
+        self._sem_dirty = True
+
+    def _append_cached_turn(self, user_query: str, payload: dict):
+        """Record a cache-served turn in the Gemini session so follow-ups see it"""
+        answer = json.dumps({
+            "output_type": payload["output_type"],
+            "code": payload["code"],
+            "explanation": payload["explanation"]
+        })
+        try:
+            self.active_chat_session.history = list(self.active_chat_session.history) + [
+                {"role": "user", "parts": [user_query]},
+                {"role": "model", "parts": [answer]}
+            ]
+        except Exception as e:
+            print(f"Error recording cached turn in Gemini history: {e}")
+
+    def _sem_cache_paths(self) -> tuple[str, str]:
+        """Paths of the cache vectors (.npz) and payloads (.jsonl)"""
+        base = os.path.join(self.base_dir, self.RESPONSE_CACHE_NAME)
+        return f"{base}.npz", f"{base}.jsonl"
+
+    def _load_sem_cache(self) -> list[tuple[np.ndarray, dict]]:
+        """Load the persisted response cache (empty if missing or inconsistent)"""
+        vectors_path, payloads_path = self._sem_cache_paths()
+        if not (os.path.exists(vectors_path) and os.path.exists(payloads_path)):
+            return []
+
+        try:
+            with np.load(vectors_path) as data:
+                vectors = data["vectors"]
+            with open(payloads_path, "r", encoding="utf-8") as f:
+                payloads = [json.loads(line) for line in f if line.strip()]
+        except Exception as e:
+            print(f"Error loading response cache: {e}")
+            return []
+
+        if len(vectors) != len(payloads):
+            return []
+        return list(zip(vectors, payloads))
+
+    def _save_sem_cache(self):
+        """
+        Persist the response cache, merged with entries other agents saved
+        since this one loaded it
+        """
+        if not self._sem_dirty:
+            return
+
+        skip = {(p["context_hash"], p["query"]) for _, p in self._sem_cache} | self._sem_evicted
+        merged = [
+            entry for entry in self._load_sem_cache()
+            if (entry[1]["context_hash"], entry[1]["query"]) not in skip
+        ] + self._sem_cache
+        if merged and len({vector.shape for vector, _ in merged}) > 1:
+            merged = self._sem_cache
+        merged = merged[-self.SEMANTIC_CACHE_MAX_ENTRIES:]
+
+        vectors_path, payloads_path = self._sem_cache_paths()
+        tmp_vectors = tmp_payloads = None
+        try:
+            os.makedirs(self.base_dir, exist_ok=True)
+            vectors = (np.vstack([vector for vector, _ in merged]) if merged
+                       else np.empty((0, 0), dtype=np.float32))
+
+            # Write both files to temp paths first, then swap them in
+            fd, tmp_vectors = tempfile.mkstemp(dir=self.base_dir, suffix=".npz.tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, vectors=vectors)
+            fd, tmp_payloads = tempfile.mkstemp(dir=self.base_dir, suffix=".jsonl.tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for _, payload in merged:
+                    f.write(json.dumps(payload) + "\n")
+
+            os.replace(tmp_vectors, vectors_path)
+            os.replace(tmp_payloads, payloads_path)
+            self._sem_dirty = False
+        except Exception as e:
+            print(f"Error saving response cache: {e}")
+            for tmp in (tmp_vectors, tmp_payloads):
+                if tmp and os.path.exists(tmp):
+                    os.remove(tmp)
+
     # ===== Utility Methods =====
 
     def update_dataframe(self, new_dataframe: pd.DataFrame):
@@ -481,16 +964,32 @@ OUTPUT FORMATTING FOR BETTER READABILITY:
         Used when DataFrame is modified (e.g., new version)
         """
         self.current_dataframe = new_dataframe
+        self.worker.load_dataframe(new_dataframe)
+        self._last_turn = None
 
     def update_context(self, new_context: str):
         """Update the dataset context"""
         self.dataset_context = new_context
+        self._last_turn = None
 
     def close_session(self):
-        """Close current chat session"""
+        """Close current chat session (waits for a running query to finish)"""
+        with self._query_lock:
+            self._close_session()
+
+    def _close_session(self):
         self._save_gemini_history()
+        if self.current_project_id and self.current_chat_id:
+            # Fold the session's history log back into the chat file
+            self.chat_manager.compact_gemini_history(self.current_project_id, self.current_chat_id)
+        self._save_sem_cache()
+        self.worker.stop()
         self.active_chat_session = None
         self.current_project_id = None
         self.current_chat_id = None
         self.current_dataframe = None
         self.dataset_context = None
+        self.system_instruction = None
+        self._instruction_hash = None
+        self._history_cursor = 0
+        self._last_turn = None
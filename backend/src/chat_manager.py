@@ -3,11 +3,15 @@ Chat Manager for AI Data Analyst v2.0
 Handles chat CRUD operations and message management
 """
 
+import threading
+from collections import OrderedDict
+from dataclasses import replace
 from typing import Optional, List
 from datetime import datetime
 
 from .models import Chat, Message
 from .state_manager import StateManager
+from .search_index import MessageSearchIndex, FTS_AVAILABLE
 
 
 class ChatManager:
@@ -16,6 +20,9 @@ class ChatManager:
     Handles chat creation, switching, and message history
     """
 
+    # Chats whose parsed messages are kept in memory
+    CHAT_CACHE_SIZE = 32
+
     def __init__(self, base_dir: str = "data"):
         """
         Initialize chat manager
@@ -25,6 +32,13 @@ class ChatManager:
         """
         self.base_dir = base_dir
         self.state_manager = StateManager(base_dir)
+        self.search_index = MessageSearchIndex(self.state_manager)
+
+        # Parsed chats, validated against the files on every get_chat() since
+        # other ChatManagers (agents, routers) write the same chats
+        # Key: (project_id, chat_id), Value: [metadata state, log id, log offset, Chat, messages]
+        self._chat_cache: OrderedDict[tuple, list] = OrderedDict()
+        self._chat_cache_lock = threading.Lock()
 
     # ===== Chat Creation =====
 
@@ -46,8 +60,7 @@ class ChatManager:
         try:
             # Auto-generate name if not provided
             if chat_name is None:
-                existing_chats = self.list_chats(project_id)
-                chat_name = f"Chat {len(existing_chats) + 1}"
+                chat_name = f"Chat {self.get_chat_count(project_id) + 1}"
 
             # Create chat object
             chat = Chat.create_new(
@@ -85,7 +98,50 @@ class ChatManager:
         Returns:
             Tuple of (Chat, List[Message]) or None if not found
         """
-        return self.state_manager.load_chat(project_id, chat_id)
+        key = (project_id, chat_id)
+        state = self.state_manager.chat_file_state(project_id, chat_id)
+        if state is None:
+            self._drop_cached_chat(project_id, chat_id)
+            return None
+        meta_state, log_id, log_size = state
+
+        with self._chat_cache_lock:
+            entry = self._chat_cache.get(key)
+            if entry is not None:
+                self._chat_cache.move_to_end(key)
+                entry = list(entry)
+
+        if entry is None or entry[1] != log_id or entry[2] > log_size:
+            # New or replaced message log - parse it in full (metadata first,
+            # it moves messages out of older chat files)
+            chat = self.state_manager.load_chat_metadata(project_id, chat_id)
+            if chat is None:
+                return None
+            messages, log_offset = self.state_manager.load_messages(project_id, chat_id)
+            entry = [meta_state, log_id, log_offset, chat, messages]
+        else:
+            if entry[2] < log_size:
+                # Only the messages appended since the cached read
+                new_messages, entry[2] = self.state_manager.load_messages(project_id, chat_id, entry[2])
+                entry[4] = entry[4] + new_messages
+            if entry[0] != meta_state:
+                chat = self.state_manager.load_chat_metadata(project_id, chat_id)
+                if chat is None:
+                    return None
+                entry[0], entry[3] = meta_state, chat
+
+        with self._chat_cache_lock:
+            self._chat_cache[key] = entry
+            self._chat_cache.move_to_end(key)
+            while len(self._chat_cache) > self.CHAT_CACHE_SIZE:
+                self._chat_cache.popitem(last=False)
+
+        # Copies - callers update the chat and list before saving them
+        return replace(entry[3]), list(entry[4])
+
+    def _drop_cached_chat(self, project_id: str, chat_id: str) -> None:
+        with self._chat_cache_lock:
+            self._chat_cache.pop((project_id, chat_id), None)
 
     def get_chat_metadata(
         self,
@@ -102,10 +158,7 @@ class ChatManager:
         Returns:
             Chat object or None if not found
         """
-        result = self.state_manager.load_chat(project_id, chat_id)
-        if result is None:
-            return None
-        return result[0]  # Return only chat, not messages
+        return self.state_manager.load_chat_metadata(project_id, chat_id)
 
     def list_chats(self, project_id: str) -> List[Chat]:
         """
@@ -117,13 +170,8 @@ class ChatManager:
         Returns:
             List of Chat objects (sorted by updated_at, most recent first)
         """
-        chat_ids = self.state_manager.list_chat_ids(project_id)
-        chats = []
-
-        for chat_id in chat_ids:
-            chat = self.get_chat_metadata(project_id, chat_id)
-            if chat is not None:
-                chats.append(chat)
+        # One index read instead of opening every chat file
+        chats = self.state_manager.load_chat_index(project_id)
 
         # Sort by updated_at (most recent first)
         chats.sort(key=lambda c: c.updated_at, reverse=True)
@@ -154,21 +202,19 @@ class ChatManager:
             Updated Chat object or None if failed
         """
         try:
-            result = self.get_chat(project_id, chat_id)
-            if result is None:
+            chat = self.get_chat_metadata(project_id, chat_id)
+            if chat is None:
                 print(f"Chat {chat_id} not found")
                 return None
 
-            chat, messages = result
-
             # Update fields
             if name is not None:
                 chat.name = name
 
             chat.updated_at = datetime.utcnow()
 
-            # Save updated chat
-            success = self.state_manager.save_chat(chat, messages)
+            # Save updated chat (metadata only - messages are unchanged)
+            success = self.state_manager.save_chat_metadata(chat)
 
             if not success:
                 print("Failed to save updated chat")
@@ -219,27 +265,40 @@ class ChatManager:
             True if successful, False otherwise
         """
         try:
-            result = self.get_chat(project_id, chat_id)
-            if result is None:
+            chat = self.get_chat_metadata(project_id, chat_id)
+            if chat is None:
                 print(f"Chat {chat_id} not found")
                 return False
 
-            chat, messages = result
-
-            # Add message
-            messages.append(message)
-
             # Update chat metadata
-            chat.message_count = len(messages)
+            chat.message_count += 1
             chat.updated_at = datetime.utcnow()
+            if message.role == "user" and chat.user_message_count is not None:
+                chat.user_message_count += 1
+            elif message.role == "assistant" and chat.assistant_message_count is not None:
+                chat.assistant_message_count += 1
 
-            # Save updated chat
-            return self.state_manager.save_chat(chat, messages)
+            # Append the message - earlier messages are not rewritten
+            return self.state_manager.append_message(chat, message)
 
         except Exception as e:
             print(f"Error adding message: {e}")
             return False
 
+    def flush_messages(self, project_id: Optional[str] = None, chat_id: Optional[str] = None) -> bool:
+        """
+        Write buffered message appends to disk now
+        Appends are otherwise written in batches within a few milliseconds
+
+        Args:
+            project_id: Project UUID (all chats if None)
+            chat_id: Chat UUID (all chats if None)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.state_manager.flush_messages(project_id, chat_id)
+
     def add_user_message(
         self,
         project_id: str,
@@ -366,8 +425,54 @@ class ChatManager:
         Returns:
             List of last N messages
         """
-        messages = self.get_messages(project_id, chat_id)
-        return messages[-n:] if len(messages) > n else messages
+        # Metadata load also migrates legacy chats to the message log
+        if self.get_chat_metadata(project_id, chat_id) is None:
+            return []
+
+        return self.state_manager.load_last_messages(project_id, chat_id, n)
+
+    def get_messages_page(
+        self,
+        project_id: str,
+        chat_id: str,
+        cursor: Optional[str] = None,
+        page_size: int = 50
+    ) -> tuple[List[Message], Optional[str]]:
+        """
+        Get one page of messages from a chat, oldest first
+        Cursors are "{epoch}:{byte offset}" - clearing or compacting the chat
+        bumps its epoch, which invalidates cursors into the old message log
+
+        Args:
+            project_id: Project UUID
+            chat_id: Chat UUID
+            cursor: next_cursor from the previous page (None for the first page)
+            page_size: Messages per page
+
+        Returns:
+            (messages, next_cursor - None after the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed or from an earlier epoch
+        """
+        chat = self.get_chat_metadata(project_id, chat_id)
+        if chat is None:
+            return [], None
+
+        offset = 0
+        if cursor is not None:
+            epoch, _, offset_str = cursor.partition(":")
+            if not (epoch.isdigit() and offset_str.isdigit()):
+                raise ValueError(f"Invalid cursor: {cursor!r}")
+            if int(epoch) != chat.epoch:
+                raise ValueError("Cursor is stale - the chat's messages were cleared or compacted")
+            offset = int(offset_str)
+
+        messages, next_offset = self.state_manager.load_messages_page(
+            project_id, chat_id, offset, page_size
+        )
+        next_cursor = f"{chat.epoch}:{next_offset}" if next_offset is not None else None
+        return messages, next_cursor
 
     # ===== Gemini Chat History =====
 
@@ -390,24 +495,69 @@ class ChatManager:
             True if successful, False otherwise
         """
         try:
-            result = self.get_chat(project_id, chat_id)
-            if result is None:
+            chat = self.get_chat_metadata(project_id, chat_id)
+            if chat is None:
                 print(f"Chat {chat_id} not found")
                 return False
 
-            chat, messages = result
-
             # Update Gemini history
             chat.gemini_chat_history = gemini_history
             chat.updated_at = datetime.utcnow()
 
-            # Save updated chat
-            return self.state_manager.save_chat(chat, messages)
+            # Save updated chat (metadata only - messages are unchanged)
+            return self.state_manager.save_chat_metadata(chat)
 
         except Exception as e:
             print(f"Error updating Gemini history: {e}")
             return False
 
+    def append_gemini_history(
+        self,
+        project_id: str,
+        chat_id: str,
+        entries: list,
+        new_session: bool = False
+    ) -> bool:
+        """
+        Append new Gemini history entries without rewriting the chat file
+        Entries go to a JSONL log that supersedes the chat's stored history
+        until compact_gemini_history() folds it back in
+
+        Args:
+            project_id: Project UUID
+            chat_id: Chat UUID
+            entries: Serializable history entries added since the last call
+            new_session: First write of a new Gemini session (replaces the log)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.state_manager.append_gemini_history(
+            project_id,
+            chat_id,
+            entries,
+            truncate=new_session
+        )
+
+    def compact_gemini_history(self, project_id: str, chat_id: str) -> bool:
+        """
+        Fold the Gemini history log into the chat file and remove the log
+
+        Args:
+            project_id: Project UUID
+            chat_id: Chat UUID
+
+        Returns:
+            True if successful (or nothing to compact), False otherwise
+        """
+        history = self.state_manager.load_gemini_history_log(project_id, chat_id)
+        if history is None:
+            return True
+
+        if not self.update_gemini_history(project_id, chat_id, history):
+            return False
+        return self.state_manager.delete_gemini_history_log(project_id, chat_id)
+
     def get_gemini_history(
         self,
         project_id: str,
@@ -423,6 +573,10 @@ class ChatManager:
         Returns:
             Gemini chat history list (empty if not found)
         """
+        history = self.state_manager.load_gemini_history_log(project_id, chat_id)
+        if history is not None:
+            return history
+
         chat = self.get_chat_metadata(project_id, chat_id)
         if chat is None:
             return []
@@ -441,6 +595,7 @@ class ChatManager:
         Returns:
             True if successful, False otherwise
         """
+        self._drop_cached_chat(project_id, chat_id)
         return self.state_manager.delete_chat(project_id, chat_id)
 
     def clear_chat_messages(self, project_id: str, chat_id: str) -> bool:
@@ -458,11 +613,14 @@ class ChatManager:
             chat = self.get_chat_metadata(project_id, chat_id)
             if chat is None:
                 return False
+            self._drop_cached_chat(project_id, chat_id)
 
-            # Reset chat metadata
+            # Reset chat metadata (new epoch - old page cursors are rejected)
             chat.message_count = 0
+            chat.epoch += 1
             chat.gemini_chat_history = []
             chat.updated_at = datetime.utcnow()
+            self.state_manager.delete_gemini_history_log(project_id, chat_id)
 
             # Save with empty messages
             return self.state_manager.save_chat(chat, messages=[])
@@ -471,6 +629,28 @@ class ChatManager:
             print(f"Error clearing chat messages: {e}")
             return False
 
+    def compact_messages(self, project_id: str, chat_id: str) -> bool:
+        """
+        Compact a chat's message log (drop torn, corrupt and duplicate records)
+
+        Args:
+            project_id: Project UUID
+            chat_id: Chat UUID
+
+        Returns:
+            True if successful (or nothing to compact), False otherwise
+        """
+        try:
+            chat = self.get_chat_metadata(project_id, chat_id)
+            if chat is None:
+                return False
+            self._drop_cached_chat(project_id, chat_id)
+            return self.state_manager.compact_message_log(chat)
+
+        except Exception as e:
+            print(f"Error compacting chat messages: {e}")
+            return False
+
     # ===== Chat Statistics =====
 
     def get_chat_stats(self, project_id: str, chat_id: str) -> dict:
@@ -481,23 +661,27 @@ class ChatManager:
             Dict with message count, timestamps, etc.
         """
         try:
-            result = self.get_chat(project_id, chat_id)
-            if result is None:
+            # Role counts are kept in the metadata as messages are added
+            chat = self.get_chat_metadata(project_id, chat_id)
+            if chat is None:
                 return {}
 
-            chat, messages = result
-
-            user_message_count = sum(1 for m in messages if m.role == "user")
-            assistant_message_count = sum(1 for m in messages if m.role == "assistant")
+            if chat.user_message_count is None or chat.assistant_message_count is None:
+                # Older chat - count once and store the counts
+                messages = self.get_messages(project_id, chat_id)
+                chat.message_count = len(messages)
+                chat.user_message_count = sum(1 for m in messages if m.role == "user")
+                chat.assistant_message_count = sum(1 for m in messages if m.role == "assistant")
+                self.state_manager.save_chat_metadata(chat)
 
             return {
                 "chat_id": chat.id,
                 "chat_name": chat.name,
                 "created_at": chat.created_at.isoformat(),
                 "updated_at": chat.updated_at.isoformat(),
-                "total_messages": len(messages),
-                "user_messages": user_message_count,
-                "assistant_messages": assistant_message_count
+                "total_messages": chat.message_count,
+                "user_messages": chat.user_message_count,
+                "assistant_messages": chat.assistant_message_count
             }
 
         except Exception as e:
@@ -523,13 +707,15 @@ class ChatManager:
         Returns:
             List of matching messages
         """
-        messages = self.get_messages(project_id, chat_id)
-        query_lower = query.lower()
+        if not query or not FTS_AVAILABLE:
+            messages = self.get_messages(project_id, chat_id)
+            query_lower = query.lower()
+            return [
+                m for m in messages
+                if query_lower in m.content.lower()
+            ]
 
-        return [
-            m for m in messages
-            if query_lower in m.content.lower()
-        ]
+        return self.search_index.search(project_id, query, chat_id).get(chat_id, [])
 
     def search_all_chats(
         self,
@@ -547,10 +733,16 @@ class ChatManager:
             Dict mapping chat_id to list of matching messages
         """
         chats = self.list_chats(project_id)
-        results = {}
 
+        if not query or not FTS_AVAILABLE:
+            matches = {chat.id: self.search_messages(project_id, chat.id, query) for chat in chats}
+        else:
+            # One index query covers every chat
+            matches = self.search_index.search(project_id, query)
+
+        results = {}
         for chat in chats:
-            matching_messages = self.search_messages(project_id, chat.id, query)
+            matching_messages = matches.get(chat.id)
             if matching_messages:
                 results[chat.id] = {
                     "chat_name": chat.name,
@@ -567,8 +759,7 @@ class ChatManager:
 
     def get_total_message_count(self, project_id: str) -> int:
         """Get total number of messages across all chats"""
-        chats = self.list_chats(project_id)
-        return sum(chat.message_count for chat in chats)
+        return sum(chat.message_count for chat in self.state_manager.load_chat_index(project_id))
 
     def export_chat_history(
         self,
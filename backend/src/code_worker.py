@@ -0,0 +1,743 @@
+"""
+Code execution worker for AI Data Analyst v2.0
+Runs generated code in a long-lived subprocess that holds the DataFrame
+"""
+
+import os
+import io
+import ast
+import sys
+import uuid
+import shutil
+import socket
+import tempfile
+import threading
+import types
+import traceback
+import weakref
+import importlib
+import importlib.util
+import contextlib
+import subprocess
+from functools import lru_cache
+from multiprocessing.connection import Connection
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+try:
+    import seaborn as sns
+except ImportError:  # pragma: no cover - seaborn is optional
+    sns = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+    pacsv = None
+
+# numba is optional - when installed, generated code is told to use pandas'
+# numba engine for custom apply/rolling functions
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# Directory containing the src package - the worker runs as `python -m src.code_worker`
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DataFrames are handed over as Arrow IPC files, in RAM where available
+_TRANSFER_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Modules every snippet can use without importing them ('df' is added per call)
+_EXEC_TEMPLATE = {
+    'pd': pd,
+    'plt': plt,
+    'np': np,
+    'sns': sns
+}
+
+# Characters of printed output kept per execution - the rest is dropped
+OUTPUT_LIMIT = int(os.getenv("EXEC_OUTPUT_LIMIT", str(64 * 1024)))
+
+# Top-level modules generated code may import - any other import is rejected
+_ALLOWED_IMPORTS = frozenset({
+    'pandas', 'numpy', 'matplotlib', 'seaborn', 'scipy',
+    'math', 'statistics', 'datetime', 're', 'ast', 'json',
+    'collections', 'itertools', 'functools', 'string', 'warnings'
+})
+
+# Names generated code may not reference (bare or as an attribute's root)
+_BLOCKED_NAMES = frozenset({
+    'os', 'sys', 'subprocess', 'socket', 'shutil', 'importlib', 'builtins',
+    'open', 'exec', 'eval', 'compile', '__import__', 'breakpoint', 'input',
+    'globals', 'locals', 'vars', 'getattr', 'setattr', 'delattr'
+})
+
+# Attribute names rejected wherever they appear - modules and process/exec
+# functions that allowed libraries re-export (e.g. pd.io.common.os). Chains
+# that can be resolved are also checked against the live objects.
+_BLOCKED_ATTRIBUTES = frozenset({
+    'os', 'sys', 'subprocess', 'socket', 'shutil', 'importlib', 'builtins',
+    'ctypes', 'pty', 'posix', 'nt', 'multiprocessing', 'marshal',
+    'system', 'popen', 'spawnl', 'spawnv', 'execv', 'execve', 'fork', 'kill'
+})
+
+# Modules whose functions generated code may not reach through an attribute
+_BLOCKED_FUNCTION_MODULES = frozenset({
+    'os', 'posix', 'nt', 'sys', 'subprocess', 'socket', 'shutil',
+    'importlib', 'builtins', 'io', '_io', 'ctypes', 'pty', 'multiprocessing'
+})
+
+# Seconds a single execution may take before the worker is killed
+EXEC_TIMEOUT = int(os.getenv("EXEC_TIMEOUT", "60"))
+
+# Seconds an idle worker stays alive - it is restarted on the next query
+WORKER_IDLE_TIMEOUT = int(os.getenv("WORKER_IDLE_TIMEOUT", "600"))
+
+
+# ===== Worker Process =====
+
+def _worker_main(conn: Connection, base_dir: str, work_dir: str):
+    """
+    Worker loop: load DataFrames and execute code until stopped or idle
+
+    Args:
+        conn: Connection for requests/responses
+        base_dir: Absolute base directory for plots and modified datasets
+        work_dir: Private working directory - concurrent workers each write
+            their own plot.png
+    """
+    os.chdir(work_dir)
+
+    if NUMBA_AVAILABLE:
+        threading.Thread(target=_warm_numba, daemon=True).start()
+
+    df = None
+    try:
+        while conn.poll(WORKER_IDLE_TIMEOUT):
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+
+            op = request[0]
+            if op == "stop":
+                break
+
+            if op == "load":
+                df = None
+                try:
+                    df = _receive_dataframe(request[1])
+                    conn.send(("loaded", None))
+                except Exception as e:
+                    conn.send(("error", f"Failed to load DataFrame: {e}"))
+
+            elif op == "exec":
+                _, code, output_type, chat_id, arrow_output = request
+                result = _run_code(df, code, output_type, base_dir, chat_id, arrow_output)
+                try:
+                    conn.send(("result", result))
+                except Exception as e:
+                    conn.send(("result", {"success": False, "error": f"Failed to return execution result: {e}"}))
+    finally:
+        os.chdir(os.path.dirname(work_dir))
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _warm_numba():
+    """
+    Pay numba's one-off import and LLVM setup at worker start instead of on
+    the first query that uses engine='numba'
+    """
+    try:
+        pd.Series(np.arange(100.0)).rolling(3).apply(lambda x: x.sum(), engine="numba", raw=True)
+    except Exception as e:
+        print(f"numba warm-up failed: {e}")
+
+
+def _receive_dataframe(payload: dict) -> Optional[pd.DataFrame]:
+    """
+    Rebuild a DataFrame sent by the agent
+    Arrow IPC files are memory-mapped, so Arrow-backed columns are not copied
+    (the mapping stays valid after the agent deletes the file)
+    """
+    if "df" in payload:
+        return payload["df"]
+
+    with pa.memory_map(payload["path"]) as source:
+        df = pa.ipc.open_stream(source).read_all().to_pandas()
+
+    # Arrow has no object type - restore object columns that came back as str
+    for i in payload["object_columns"]:
+        df.isetitem(i, df.iloc[:, i].astype(object))
+    return df
+
+
+def _arrow_csv_safe(df: pd.DataFrame) -> bool:
+    """
+    Check whether Arrow's CSV writer output reads back like to_csv's
+    Arrow writes integral floats without ".0" (1.0 -> 1, which re-reads as
+    int) and formats datetimes differently, so those frames stay on pandas
+    """
+    if not df.columns.is_unique or df.shape[1] == 0:
+        return False
+    # A lone null in a one-column frame becomes a blank line, which readers skip
+    if df.shape[1] == 1 and df.iloc[:, 0].isna().any():
+        return False
+
+    for _, col in df.items():
+        dtype = col.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            continue
+        if pd.api.types.is_string_dtype(dtype):
+            if dtype == object and pd.api.types.infer_dtype(col, skipna=True) not in ("string", "empty"):
+                return False
+            continue
+        if pd.api.types.is_float_dtype(dtype) and not isinstance(col.dtype, pd.CategoricalDtype):
+            # Safe once any value is NaN or non-integral - the column re-reads as float
+            values = col.to_numpy(dtype="float64", na_value=np.nan)
+            if np.isnan(values).any() or (np.mod(values, 1) != 0).any():
+                continue
+        return False
+
+    return True
+
+
+def _write_csv(df: pd.DataFrame, path: str) -> None:
+    """Write a DataFrame as CSV, with Arrow's multithreaded writer when it is safe"""
+    if pacsv is not None and _arrow_csv_safe(df):
+        try:
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+            return
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            pass  # e.g. nested values - pandas overwrites the partial file
+
+    df.to_csv(path, index=False)
+
+
+class _BoundedOutput(io.TextIOBase):
+    """stdout replacement that keeps the first `limit` characters written"""
+
+    def __init__(self, limit: int = OUTPUT_LIMIT):
+        self.limit = limit
+        self.truncated = False
+        self._parts = []
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        room = self.limit - self._size
+        if room > 0:
+            self._parts.append(s[:room])
+            self._size += min(len(s), room)
+        if len(s) > room:
+            self.truncated = True
+        return len(s)
+
+    def getvalue(self) -> str:
+        output = "".join(self._parts)
+        if self.truncated:
+            output += f"\n…[output truncated at {self.limit:,} characters]\n"
+        return output
+
+
+class _CodeValidator(ast.NodeVisitor):
+    """
+    Rejects imports, names and attributes outside the allowlist before anything runs
+    Attribute chains rooted at a known module (pd, np, an import, or a name
+    assigned from one) are resolved against the worker's live objects, so a
+    disallowed module or process function reached through an allowed library
+    (pd.io.common.os.system) is rejected as well
+    """
+
+    def __init__(self):
+        # Names bound to objects the validator can resolve
+        self._known = {name: value for name, value in _EXEC_TEMPLATE.items() if value is not None}
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self._check_module(alias.name)
+            name = alias.name if alias.asname else alias.name.split(".")[0]
+            module = self._import(name)
+            if module is not None:
+                self._known[alias.asname or name] = module
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.level:
+            raise ValueError("Relative imports are not allowed")
+        self._check_module(node.module)
+        module = self._import(node.module)
+        for alias in node.names:
+            if alias.name == "*":
+                raise ValueError("Star imports are not allowed")
+            if alias.name in _BLOCKED_ATTRIBUTES or alias.name.startswith("__"):
+                raise ValueError(f"Import of '{alias.name}' is not allowed")
+            if module is None:
+                continue
+            if hasattr(module, alias.name):
+                value = getattr(module, alias.name)
+            else:
+                value = self._import(f"{node.module}.{alias.name}")
+            if value is not None:
+                self._check_object(value, f"{node.module}.{alias.name}")
+                self._known[alias.asname or alias.name] = value
+
+    def visit_Assign(self, node: ast.Assign):
+        self.generic_visit(node)
+        # Track aliases like `common = pd.io.common` so later chains resolve
+        value = self._resolve(node.value)
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                if value is not None:
+                    self._known[target.id] = value
+                else:
+                    self._known.pop(target.id, None)
+
+    def visit_Name(self, node: ast.Name):
+        if node.id in _BLOCKED_NAMES:
+            raise ValueError(f"Use of '{node.id}' is not allowed")
+
+    def visit_Attribute(self, node: ast.Attribute):
+        # Dunder attributes are the way out of the sandbox (__class__, __globals__, ...)
+        if node.attr.startswith("__"):
+            raise ValueError(f"Access to '{node.attr}' is not allowed")
+        if node.attr in _BLOCKED_ATTRIBUTES:
+            raise ValueError(f"Access to '{node.attr}' is not allowed")
+        self._resolve(node)
+        self.generic_visit(node)
+
+    def _resolve(self, node: ast.AST):
+        """
+        Resolve a Name / Attribute chain to its live object, checking every step
+        Returns None when the chain can't be resolved statically
+        """
+        if isinstance(node, ast.Name):
+            return self._known.get(node.id)
+        if not isinstance(node, ast.Attribute):
+            return None
+
+        base = self._resolve(node.value)
+        # Only walk modules and classes - reading their attributes has no side effects
+        if base is None or not isinstance(base, (types.ModuleType, type)):
+            return None
+        try:
+            value = getattr(base, node.attr)
+        except AttributeError:
+            return None
+        self._check_object(value, node.attr)
+        return value
+
+    @staticmethod
+    def _import(name: str):
+        """Import an allowed module, or None if it isn't installed (the run fails on it)"""
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            return None
+
+    @staticmethod
+    def _check_object(value, name: str):
+        """Reject disallowed modules and functions of blocked modules"""
+        if isinstance(value, types.ModuleType):
+            if value.__name__.split(".")[0] not in _ALLOWED_IMPORTS:
+                raise ValueError(f"Access to module '{value.__name__}' is not allowed")
+        elif callable(value):
+            module = getattr(value, "__module__", None) or ""
+            if module.split(".")[0] in _BLOCKED_FUNCTION_MODULES:
+                raise ValueError(f"Access to '{name}' is not allowed")
+
+    @staticmethod
+    def _check_module(name: str):
+        if name.split(".")[0] not in _ALLOWED_IMPORTS:
+            raise ValueError(f"Import of '{name}' is not allowed")
+
+
+@lru_cache(maxsize=512)
+def _compile(source: str):
+    """
+    Validate and compile a snippet once - the same generated code recurs across queries
+
+    Raises:
+        SyntaxError: If the code does not parse
+        ValueError: If the code uses a disallowed import or name
+    """
+    tree = ast.parse(source, "<gemini_agent>", "exec")
+    _CodeValidator().visit(tree)
+    # Compile the validated tree - no second parse of the source
+    return compile(tree, "<gemini_agent>", "exec")
+
+
+@lru_cache(maxsize=None)
+def _output_dirs(base_dir: str) -> tuple:
+    """Create the plots/ and temp_modifications/ directories once per worker"""
+    plot_dir = os.path.join(base_dir, "plots")
+    mod_dir = os.path.join(base_dir, "temp_modifications")
+    os.makedirs(plot_dir, exist_ok=True)
+    os.makedirs(mod_dir, exist_ok=True)
+    return plot_dir, mod_dir
+
+
+@lru_cache(maxsize=1024)
+def _plot_path(base_dir: str, chat_id: str) -> str:
+    """Final location of a chat's plot"""
+    return os.path.join(_output_dirs(base_dir)[0], f"plot_{chat_id}.png")
+
+
+def _write_arrow(df: pd.DataFrame, path: str) -> bool:
+    """Write df as an Arrow IPC stream, keeping its dtypes; False if Arrow can't hold it"""
+    if pa is None:
+        return False
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return True
+    except (pa.ArrowException, ValueError, TypeError) as e:
+        print(f"Arrow output skipped: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(path)
+        return False
+
+
+def _run_code(
+    df: Optional[pd.DataFrame],
+    code: str,
+    output_type: str,
+    base_dir: str,
+    chat_id: str,
+    arrow_output: bool = False
+) -> dict:
+    """Execute Python code against df and collect its output"""
+    try:
+        # Debug logging
+        print(f"[DEBUG] Executing code (output_type={output_type})")
+        print(f"[DEBUG] DataFrame shape: {df.shape if df is not None else 'None'}")
+
+        # Reject unparseable or disallowed code before touching the DataFrame
+        try:
+            compiled = _compile(code)
+        except (SyntaxError, ValueError) as e:
+            return {
+                "success": False,
+                "error": f"{type(e).__name__}: {e}"
+            }
+
+        # Prepare execution environment (a copy - exec adds the snippet's names)
+        exec_globals = _EXEC_TEMPLATE.copy()
+        exec_globals['df'] = df
+
+        # Execute code, capturing stdout
+        with contextlib.redirect_stdout(_BoundedOutput()) as captured_output:
+            exec(compiled, exec_globals)
+        output = captured_output.getvalue()
+
+        # Process result based on output type
+        result_data = {
+            "success": True,
+            "output": output
+        }
+
+        if output_type == "visualization":
+            # Move plot to proper location (a rename - work_dir is under base_dir)
+            plot_path = _plot_path(base_dir, chat_id)
+            try:
+                try:
+                    os.replace("plot.png", plot_path)
+                except FileNotFoundError:
+                    if not os.path.exists("plot.png"):
+                        raise
+                    # plots/ was removed behind the worker's back
+                    _output_dirs.cache_clear()
+                    _plot_path.cache_clear()
+                    plot_path = _plot_path(base_dir, chat_id)
+                    os.replace("plot.png", plot_path)
+                result_data["plot_path"] = plot_path
+            except FileNotFoundError:
+                result_data["success"] = False
+                result_data["error"] = "Code executed but no plot was saved. Make sure to use plt.savefig('plot.png')"
+
+        elif output_type == "modification":
+            # Check if 'result' variable exists
+            if 'result' in exec_globals:
+                modified_df = exec_globals['result']
+
+                # Validate it's a DataFrame
+                if isinstance(modified_df, pd.DataFrame):
+                    print(f"[DEBUG] Modified DataFrame shape: {modified_df.shape}")
+                    print(f"[DEBUG] Modified DataFrame columns: {list(modified_df.columns)}")
+
+                    # Save modified DataFrame to temp location
+                    temp_dir = _output_dirs(base_dir)[1]
+                    temp_filename = f"{chat_id}_{uuid.uuid4().hex[:8]}.csv"
+                    temp_path = os.path.join(temp_dir, temp_filename)
+
+                    _write_csv(modified_df, temp_path)
+                    result_data["modified_dataframe_path"] = temp_path
+
+                    # Same data as an Arrow stream for clients that read it directly
+                    if arrow_output:
+                        arrow_path = temp_path[:-len(".csv")] + ".arrow"
+                        if _write_arrow(modified_df, arrow_path):
+                            result_data["modified_arrow_path"] = arrow_path
+
+                    # Generate modification summary (matching frontend expectations)
+                    preview_data = modified_df.head(10).to_dict('records')
+                    # Index.difference hashes through the Indexes' own engines (sort=False keeps column order)
+                    result_data["modification_summary"] = {
+                        "before_rows": len(df),
+                        "after_rows": len(modified_df),
+                        "before_columns": len(df.columns),
+                        "after_columns": len(modified_df.columns),
+                        "preview": preview_data,
+                        "new_columns": modified_df.columns.difference(df.columns, sort=False).tolist(),
+                        "removed_columns": df.columns.difference(modified_df.columns, sort=False).tolist()
+                    }
+                    print(f"[DEBUG] Modification summary: rows {result_data['modification_summary']['before_rows']} → {result_data['modification_summary']['after_rows']}, preview rows: {len(preview_data)}")
+                else:
+                    result_data["success"] = False
+                    result_data["error"] = f"'result' variable is not a DataFrame (type: {type(modified_df).__name__})"
+            else:
+                result_data["success"] = False
+                result_data["error"] = "Modification query must assign output to 'result' variable"
+
+        elif output_type == "exploratory":
+            # Just use the printed output
+            result_data["result"] = output
+
+        return result_data
+
+    except BaseException as e:
+        # BaseException too: generated code calling exit() must not kill the worker
+        error_msg = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
+        return {
+            "success": False,
+            "error": error_msg
+        }
+
+    finally:
+        # Figures the snippet left open would pile up in the long-lived worker
+        plt.close("all")
+
+
+# ===== Agent Side =====
+
+def _stop_process(process: subprocess.Popen, conn: Connection, work_dir: str, pending_loads: list) -> None:
+    """Stop a worker process and remove its files (also used as the GC finalizer)"""
+    try:
+        conn.send(("stop",))
+    except (OSError, ValueError):
+        pass
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    conn.close()
+    _remove_files(work_dir, pending_loads)
+
+
+def _remove_files(work_dir: Optional[str], pending_loads: list) -> None:
+    """Remove a worker's directory and any transfer files it never picked up"""
+    if work_dir:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    for path in pending_loads:
+        if path and os.path.exists(path):
+            os.remove(path)
+    pending_loads.clear()
+
+
+class CodeWorker:
+    """
+    Handle to a code execution subprocess for one agent
+    The worker is started on demand, keeps the current DataFrame loaded
+    between queries and exits on its own after WORKER_IDLE_TIMEOUT
+    """
+
+    def __init__(self, base_dir: str = "data", timeout: int = EXEC_TIMEOUT):
+        """
+        Initialize worker handle (no process is started yet)
+
+        Args:
+            base_dir: Base directory for plots and modified datasets
+            timeout: Seconds a single execution may take
+        """
+        self.base_dir = base_dir
+        self.timeout = timeout
+        self.dataframe = None
+
+        self._process = None
+        self._conn = None
+        self._work_dir = None
+        self._finalizer = None
+        # Transfer files sent to the worker and not yet acknowledged
+        self._pending_loads: list[Optional[str]] = []
+        self._lock = threading.Lock()
+
+    def load_dataframe(self, dataframe: pd.DataFrame) -> None:
+        """
+        Hand a DataFrame to the worker, starting it if needed
+        Returns immediately - the worker loads it while the query is prepared
+        """
+        with self._lock:
+            self.dataframe = dataframe
+            if self._is_alive():
+                self._send_dataframe()
+            else:
+                self._start()
+
+    def execute(self, code: str, output_type: str, chat_id: str, arrow_output: bool = False) -> dict:
+        """
+        Execute code in the worker
+
+        Args:
+            code: Python code to run against 'df'
+            output_type: exploratory, visualization or modification
+            chat_id: Chat UUID (names the plot / modified dataset files)
+            arrow_output: Also write a modified dataset as an Arrow IPC stream
+
+        Returns:
+            Dict with success, output and output-type specific fields
+        """
+        with self._lock:
+            if not self._is_alive():
+                self._start()
+
+            try:
+                self._conn.send(("exec", code, output_type, chat_id, arrow_output))
+                while True:
+                    if not self._conn.poll(self.timeout):
+                        self._kill()
+                        return {
+                            "success": False,
+                            "error": f"Code execution timed out after {self.timeout} seconds"
+                        }
+
+                    kind, payload = self._conn.recv()
+                    if kind == "result":
+                        return self._relative_paths(payload)
+
+                    # Acknowledgement of an earlier load - its file can go
+                    _remove_files(None, [self._pending_loads.pop(0)])
+                    if kind == "error":
+                        print(payload)
+            except (EOFError, OSError) as e:
+                self._kill()
+                return {
+                    "success": False,
+                    "error": f"Code execution worker exited unexpectedly: {e}"
+                }
+
+    def stop(self) -> None:
+        """Stop the worker process and release its DataFrame"""
+        with self._lock:
+            if self._finalizer is not None:
+                self._finalizer()
+            self._reset()
+            self.dataframe = None
+
+    # ===== Internals =====
+
+    def _is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self) -> None:
+        """
+        Start a worker as a fresh interpreter - a fork would inherit the
+        parent's threads and gRPC state, and multiprocessing's spawn re-imports
+        the parent's __main__ (Streamlit, uvicorn) into every worker
+        """
+        if self._process is not None:
+            # Previous worker exited (idle timeout or crash) - reap it, close
+            # its socket and detach its finalizer before replacing it
+            self._kill()
+        else:
+            self._reset()
+
+        # Under base_dir so saved plots are renamed into place, not copied
+        base_dir = os.path.abspath(self.base_dir)
+        os.makedirs(base_dir, exist_ok=True)
+        self._work_dir = tempfile.mkdtemp(prefix=".exec_", dir=base_dir)
+        parent_sock, child_sock = socket.socketpair()
+        with child_sock:
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "src.code_worker",
+                 str(child_sock.fileno()), base_dir, self._work_dir],
+                cwd=_BACKEND_DIR,
+                env={**os.environ, "MPLBACKEND": "Agg"},
+                pass_fds=(child_sock.fileno(),)
+            )
+        self._conn = Connection(parent_sock.detach())
+        self._finalizer = weakref.finalize(
+            self, _stop_process, self._process, self._conn, self._work_dir, self._pending_loads
+        )
+
+        if self.dataframe is not None:
+            self._send_dataframe()
+
+    def _send_dataframe(self) -> None:
+        """Send the DataFrame as an Arrow IPC file (pickled if Arrow can't hold it)"""
+        path = None
+        payload = None
+        if pa is not None:
+            try:
+                table = pa.Table.from_pandas(self.dataframe)
+                fd, path = tempfile.mkstemp(prefix="ai_df_", suffix=".arrow", dir=_TRANSFER_DIR)
+                os.close(fd)
+                with pa.OSFile(path, "wb") as sink:
+                    with pa.ipc.new_stream(sink, table.schema) as writer:
+                        writer.write_table(table)
+                payload = {
+                    "path": path,
+                    "object_columns": [
+                        i for i, dtype in enumerate(self.dataframe.dtypes) if dtype == object
+                    ]
+                }
+            except Exception:
+                # e.g. mixed-type object columns
+                _remove_files(None, [path])
+                path = None
+
+        if payload is None:
+            payload = {"df": self.dataframe}
+
+        self._pending_loads.append(path)
+        self._conn.send(("load", payload))
+
+    def _relative_paths(self, result: dict) -> dict:
+        """Report output files under base_dir as given, like in-process execution did"""
+        for key in ("plot_path", "modified_dataframe_path", "modified_arrow_path"):
+            if result.get(key):
+                result[key] = os.path.join(
+                    self.base_dir, os.path.relpath(result[key], os.path.abspath(self.base_dir))
+                )
+        return result
+
+    def _kill(self) -> None:
+        """Kill a stuck or broken worker - the next query restarts it"""
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+        if self._finalizer is not None:
+            self._finalizer.detach()
+        if self._conn is not None:
+            self._conn.close()
+        self._reset()
+
+    def _reset(self) -> None:
+        _remove_files(self._work_dir, self._pending_loads)
+        # A fresh list per worker - a finalizer still referencing the old one
+        # must never clear the next worker's transfer files
+        self._pending_loads = []
+        self._process = None
+        self._conn = None
+        self._work_dir = None
+        self._finalizer = None
+
+
+if __name__ == "__main__":
+    _worker_main(Connection(int(sys.argv[1])), sys.argv[2], sys.argv[3])
@@ -8,6 +8,12 @@ import pandas as pd
 import ast
 from typing import Optional
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:  # pragma: no cover - polars is optional
+    POLARS_AVAILABLE = False
+
 
 def _detect_data_format(sample_values):
     """
@@ -48,6 +54,110 @@ def _detect_data_format(sample_values):
     return None, None
 
 
+def _head_non_null(series: pd.Series, n: int = 5) -> list:
+    """
+    First n non-null values of a column
+    Looks at a growing prefix instead of dropna() on the whole column, so a
+    column with values near the top costs a few rows, not a full copy
+    """
+    window = 64
+    while True:
+        values = series.iloc[:window].dropna()
+        if len(values) >= n or window >= len(series):
+            return values.head(n).tolist()
+        window *= 16
+
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a DataFrame for read-only analysis and display
+
+    Integers are downcast to the smallest type holding their range, floats
+    go to float32 only where that is lossless, and text columns with under
+    50% distinct values become category. Not meant for frames handed to the
+    AI agent - narrow ints overflow and categories reject new values.
+
+    Args:
+        df: DataFrame to optimize (modified in place)
+
+    Returns:
+        The same DataFrame
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series) and series.dtype != "float32":
+            as_float32 = series.astype("float32")
+            if ((as_float32 == series) | series.isna()).all():
+                df[col] = as_float32
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if len(series) > 0 and series.nunique(dropna=False) / len(series) < 0.5:
+                df[col] = series.astype("category")
+    return df
+
+
+# Columns with at most this many unique values get their value counts listed
+MAX_LISTED_UNIQUE = 50
+
+# Rows used to guess whether a text column is low-cardinality
+CARDINALITY_SAMPLE_ROWS = 1000
+
+
+def _column_counts(df: pd.DataFrame) -> tuple[pd.Series, pd.Series, dict]:
+    """
+    Non-null and unique (non-null) value counts for every column
+    Uses Polars when installed - it counts all columns in parallel
+
+    Returns:
+        (non_null_counts, unique_counts, value_counts) - the first two indexed
+        by column, value_counts maps a column to its value_counts() where that
+        was already computed
+    """
+    if POLARS_AVAILABLE:
+        renamed = df.rename(columns=str)
+        if renamed.columns.is_unique:
+            try:
+                pl_df = pl.from_pandas(renamed, nan_to_null=True)
+                nulls = pl_df.null_count().row(0)
+                uniques = pl_df.select(pl.all().n_unique()).row(0)
+                # n_unique counts null as a value, pandas nunique() does not
+                return (
+                    pd.Series([pl_df.height - k for k in nulls], index=df.columns),
+                    pd.Series([u - (k > 0) for u, k in zip(uniques, nulls)], index=df.columns),
+                    {}
+                )
+            except Exception:
+                # Columns Polars can't convert (e.g. mixed-type objects)
+                pass
+
+    # Text columns that look low-cardinality get value_counts() straight away -
+    # the context lists those counts anyway, and their length and sum are the
+    # unique and non-null counts, so the column is hashed once instead of twice
+    value_counts = {
+        col: series.value_counts()
+        for col, series in df.items()
+        if not pd.api.types.is_numeric_dtype(series.dtype)
+        and series.iloc[:CARDINALITY_SAMPLE_ROWS].nunique() <= MAX_LISTED_UNIQUE
+    }
+    rest = df[[col for col in df.columns if col not in value_counts]]
+
+    non_null_counts = rest.count().to_dict()
+    unique_counts = rest.nunique().to_dict()
+    for col, counts in value_counts.items():
+        non_null_counts[col] = int(counts.sum())
+        # Categoricals also list unobserved categories, with a count of 0
+        unique_counts[col] = int((counts > 0).sum())
+
+    return (
+        pd.Series(non_null_counts).reindex(df.columns),
+        pd.Series(unique_counts).reindex(df.columns),
+        value_counts
+    )
+
+
 def generate_eda_context(df: pd.DataFrame, dataset_name: str = "Dataset") -> str:
     """
     Generate a concise string representation of the dataset for AI context
@@ -68,25 +178,36 @@ def generate_eda_context(df: pd.DataFrame, dataset_name: str = "Dataset") -> str
     context_parts.append(f"Shape: {rows:,} rows × {cols} columns")
     context_parts.append(f"\nColumns and Data Types:")
 
+    # Column stats computed once for the whole frame, not per column
+    non_null_counts, unique_counts, column_value_counts = _column_counts(df)
+    numeric_cols = [col for col, dtype in df.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+    numeric = df[numeric_cols]
+    min_vals = numeric.min()
+    max_vals = numeric.max()
+
     # Column info with types, nulls, unique counts, and ranges/top values
     for col in df.columns:
         dtype = str(df[col].dtype)
-        non_null = df[col].notna().sum()
-        unique = df[col].nunique()
+        non_null = non_null_counts[col]
+        unique = unique_counts[col]
 
         col_str = f"  - {col} ({dtype}): {non_null:,} non-null, {unique:,} unique"
 
         # Add range for numerical columns - CRITICAL for AI to understand data bounds
-        if pd.api.types.is_numeric_dtype(df[col]) and non_null > 0:
-            min_val = df[col].min()
-            max_val = df[col].max()
+        if col in min_vals.index and non_null > 0:
+            min_val = min_vals[col]
+            max_val = max_vals[col]
             col_str += f", range: [{min_val:.2f}, {max_val:.2f}]"
 
         # Check if column contains serialized collections FIRST (before categorical check)
         elif non_null > 0:
-            sample_vals = df[col].dropna().head(5).tolist()
+            sample_vals = _head_non_null(df[col])
             data_format, example = _detect_data_format(sample_vals)
 
+            value_counts = column_value_counts.get(col)
+            if value_counts is None and unique <= MAX_LISTED_UNIQUE:
+                value_counts = df[col].value_counts()
+
             if data_format:
                 # Add format hint for AI
                 format_hints = {
@@ -100,12 +221,10 @@ def generate_eda_context(df: pd.DataFrame, dataset_name: str = "Dataset") -> str
 
                 # Still show the values for low cardinality
                 if unique <= 10:
-                    value_counts = df[col].value_counts()
                     vals_with_counts = [f"{str(v)[:30]}({c})" for v, c in value_counts.items()]
                     col_str += f"\n    {format_hints[data_format]}, values: {', '.join(vals_with_counts)}"
-                elif unique <= 50:
-                    value_counts = df[col].value_counts().head(10)
-                    vals_with_counts = [f"{str(v)[:30]}({c})" for v, c in value_counts.items()]
+                elif unique <= MAX_LISTED_UNIQUE:
+                    vals_with_counts = [f"{str(v)[:30]}({c})" for v, c in value_counts.head(10).items()]
                     col_str += f"\n    {format_hints[data_format]}, top 10: {', '.join(vals_with_counts)}"
                 else:
                     col_str += f"\n    {format_hints[data_format]} - example: {example}"
@@ -120,13 +239,11 @@ def generate_eda_context(df: pd.DataFrame, dataset_name: str = "Dataset") -> str
             # Add unique values for regular categorical columns (not serialized collections)
             elif unique > 0 and unique <= 10:
                 # For very low cardinality, show ALL unique values with counts
-                value_counts = df[col].value_counts()
                 vals_with_counts = [f"{str(v)[:30]}({c})" for v, c in value_counts.items()]
                 col_str += f", values: {', '.join(vals_with_counts)}"
-            elif unique <= 50:
+            elif unique <= MAX_LISTED_UNIQUE:
                 # For moderate cardinality, show top 10 with counts
-                value_counts = df[col].value_counts().head(10)
-                vals_with_counts = [f"{str(v)[:30]}({c})" for v, c in value_counts.items()]
+                vals_with_counts = [f"{str(v)[:30]}({c})" for v, c in value_counts.head(10).items()]
                 col_str += f", top 10: {', '.join(vals_with_counts)}"
 
         context_parts.append(col_str)
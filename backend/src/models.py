@@ -90,7 +90,7 @@ class Project:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Chat:
     """
     Represents a chat session within a project
@@ -103,6 +103,11 @@ class Chat:
     updated_at: datetime
     message_count: int
     gemini_chat_history: list = field(default_factory=list)
+    epoch: int = 0  # Bumped whenever the message log is rewritten in place of appends
+
+    # Messages by role - None for chats saved before these were tracked
+    user_message_count: Optional[int] = None
+    assistant_message_count: Optional[int] = None
 
     def to_dict(self) -> dict:
         """Serialize to dictionary for JSON storage"""
@@ -113,7 +118,10 @@ class Chat:
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "message_count": self.message_count,
-            "gemini_chat_history": self.gemini_chat_history
+            "gemini_chat_history": self.gemini_chat_history,
+            "epoch": self.epoch,
+            "user_message_count": self.user_message_count,
+            "assistant_message_count": self.assistant_message_count
         }
 
     @classmethod
@@ -126,7 +134,10 @@ class Chat:
             created_at=datetime.fromisoformat(data["created_at"]),
             updated_at=datetime.fromisoformat(data["updated_at"]),
             message_count=data["message_count"],
-            gemini_chat_history=data.get("gemini_chat_history", [])
+            gemini_chat_history=data.get("gemini_chat_history", []),
+            epoch=data.get("epoch", 0),
+            user_message_count=data.get("user_message_count"),
+            assistant_message_count=data.get("assistant_message_count")
         )
 
     @classmethod
@@ -140,11 +151,13 @@ class Chat:
             created_at=now,
             updated_at=now,
             message_count=0,
-            gemini_chat_history=[]
+            gemini_chat_history=[],
+            user_message_count=0,
+            assistant_message_count=0
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Represents a single message in a chat
@@ -8,6 +8,7 @@ from typing import Optional, List
 from datetime import datetime
 import pandas as pd
 
+from .eda_utils import generate_eda_context
 from .models import Project, Chat
 from .state_manager import StateManager
 from .version_manager import VersionManager
@@ -152,6 +153,48 @@ class ProjectManager:
         """Check if project exists"""
         return self.state_manager.project_exists(project_id)
 
+    def get_eda_context(
+        self,
+        project_id: str,
+        df: Optional[pd.DataFrame] = None,
+        dataset_name: str = "Dataset"
+    ) -> Optional[str]:
+        """
+        Get the AI EDA context for a project's current data
+        Cached in eda_context.json per data version, so it is generated once
+        per version rather than once per chat session or process
+
+        Args:
+            project_id: Project UUID
+            df: Current DataFrame, if already loaded (loaded on a cache miss otherwise)
+            dataset_name: Name used in the context header
+
+        Returns:
+            EDA context string or None if the project or CSV is not found
+        """
+        project = self.get_project(project_id)
+        if project is None:
+            return None
+
+        cached = self.state_manager.load_eda_context(project_id)
+        if (cached
+                and cached.get("version") == project.current_version
+                and cached.get("dataset_name") == dataset_name):
+            return cached["context"]
+
+        if df is None:
+            df = self.version_manager.load_current_dataframe(project_id)
+            if df is None:
+                return None
+
+        context = generate_eda_context(df, dataset_name)
+        self.state_manager.save_eda_context(project_id, {
+            "version": project.current_version,
+            "dataset_name": dataset_name,
+            "context": context
+        })
+        return context
+
     # ===== Project Updates =====
 
     def update_project_metadata(
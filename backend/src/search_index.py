@@ -0,0 +1,211 @@
+"""
+Message search index for AI Data Analyst v2.0
+One SQLite FTS5 database per project (projects/{id}/search.db), brought up to
+date with the chats' message logs before every search
+"""
+
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import closing
+from typing import Dict, List, Optional
+
+from .models import Message
+from .state_manager import StateManager
+from .utils import get_messages_log_path, get_project_directory, get_search_db_path
+
+
+def _fts_trigram_available() -> bool:
+    """Check that this SQLite build has FTS5 with the trigram tokenizer (3.34+)"""
+    try:
+        with closing(sqlite3.connect(":memory:")) as conn:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(content, tokenize = 'trigram')")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+FTS_AVAILABLE = _fts_trigram_available()
+
+# The trigram index only serves queries of 3+ characters - shorter ones use LIKE
+MIN_MATCH_CHARS = 3
+
+# Trigram tokens match substrings case-insensitively, like the old linear scan
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    chat_id UNINDEXED,
+    message_id UNINDEXED,
+    log_offset UNINDEXED,
+    content,
+    tokenize = 'trigram'
+);
+CREATE TABLE IF NOT EXISTS indexed_logs (
+    chat_id TEXT PRIMARY KEY,
+    log_dev INTEGER,
+    log_ino INTEGER,
+    log_offset INTEGER NOT NULL
+);
+"""
+
+# Serializes index updates per project database
+_sync_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_sync_locks_guard = threading.Lock()
+
+
+class MessageSearchIndex:
+    """
+    Full-text index over chat messages
+    Each chat's indexed position in its message log is recorded, so a search
+    only indexes messages appended since the last one. A log that was
+    rewritten (different inode, or shorter) is indexed again from the start.
+    """
+
+    def __init__(self, state_manager: StateManager):
+        """
+        Initialize search index
+
+        Args:
+            state_manager: StateManager that owns the message logs
+        """
+        self.state_manager = state_manager
+        self.base_dir = state_manager.base_dir
+
+    def search(
+        self,
+        project_id: str,
+        query: str,
+        chat_id: Optional[str] = None
+    ) -> Dict[str, List[Message]]:
+        """
+        Search messages in a project (or in one chat of it)
+
+        Args:
+            project_id: Project UUID
+            query: Non-empty search query (case-insensitive substring)
+            chat_id: Restrict the search to this chat
+
+        Returns:
+            Dict mapping chat_id to matching messages (chronological order)
+        """
+        if not os.path.isdir(get_project_directory(self.base_dir, project_id)):
+            return {}
+
+        db_path = get_search_db_path(self.base_dir, project_id)
+        with _sync_locks_guard:
+            sync_lock = _sync_locks[db_path]
+
+        with sync_lock, closing(sqlite3.connect(db_path, timeout=30)) as conn:
+            conn.executescript(_SCHEMA)
+            self._sync(conn, project_id)
+            matches = self._match(conn, query, chat_id)
+
+        query_lower = query.lower()
+        results = {}
+        for match_chat_id, hits in matches.items():
+            messages = self.state_manager.load_messages_at(
+                project_id, match_chat_id, [offset for offset, _ in hits]
+            )
+            ids = {message_id for _, message_id in hits}
+            # Offsets may be stale if the log was rewritten after syncing, and
+            # SQLite folds case slightly differently from str.lower()
+            messages = [
+                m for m in messages
+                if m.id in ids and query_lower in m.content.lower()
+            ]
+            if messages:
+                results[match_chat_id] = messages
+
+        return results
+
+    def _sync(self, conn: sqlite3.Connection, project_id: str) -> None:
+        """Index messages appended (or rewritten) since the last sync"""
+        self.state_manager.flush_messages(project_id)
+
+        chat_ids = set(self.state_manager.list_chat_ids(project_id))
+        indexed = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT chat_id, log_dev, log_ino, log_offset FROM indexed_logs"
+            )
+        }
+
+        with conn:
+            for chat_id in indexed.keys() - chat_ids:
+                self._drop_chat(conn, chat_id)
+
+            for chat_id in chat_ids:
+                log_id, log_size = self._log_state(project_id, chat_id)
+                known = indexed.get(chat_id)
+
+                if log_id is None and known is None:
+                    # Legacy chats keep messages in their metadata file until
+                    # first loaded - loading migrates them to a message log
+                    self.state_manager.load_chat_metadata(project_id, chat_id)
+                    log_id, log_size = self._log_state(project_id, chat_id)
+
+                offset = 0
+                if known is not None:
+                    same_log = tuple(known[:2]) == (log_id or (None, None))
+                    if same_log and log_size == known[2]:
+                        continue
+                    if same_log and log_size > known[2]:
+                        offset = known[2]
+                    else:
+                        self._drop_chat(conn, chat_id)
+
+                records, end = self.state_manager.read_message_records(project_id, chat_id, offset)
+                conn.executemany(
+                    "INSERT INTO messages_fts (chat_id, message_id, log_offset, content) VALUES (?, ?, ?, ?)",
+                    [
+                        (chat_id, record.get("id"), record_offset, record.get("content") or "")
+                        for record_offset, record in records
+                    ]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO indexed_logs VALUES (?, ?, ?, ?)",
+                    (chat_id, *(log_id or (None, None)), end)
+                )
+
+    def _log_state(self, project_id: str, chat_id: str) -> tuple:
+        """(device, inode) and size of a chat's message log, or (None, 0)"""
+        try:
+            log = os.stat(get_messages_log_path(self.base_dir, project_id, chat_id))
+        except FileNotFoundError:
+            return None, 0
+        return (log.st_dev, log.st_ino), log.st_size
+
+    @staticmethod
+    def _drop_chat(conn: sqlite3.Connection, chat_id: str) -> None:
+        """Remove a chat from the index"""
+        conn.execute("DELETE FROM messages_fts WHERE chat_id = ?", (chat_id,))
+        conn.execute("DELETE FROM indexed_logs WHERE chat_id = ?", (chat_id,))
+
+    @staticmethod
+    def _match(
+        conn: sqlite3.Connection,
+        query: str,
+        chat_id: Optional[str]
+    ) -> Dict[str, List[tuple]]:
+        """Run the index query, grouping (log_offset, message_id) hits by chat"""
+        if len(query) >= MIN_MATCH_CHARS:
+            # Quoted as one phrase so FTS5 operators in the query are literal
+            condition = "content MATCH ?"
+            params = ['"' + query.replace('"', '""') + '"']
+        else:
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            condition = "content LIKE ? ESCAPE '\\'"
+            params = [f"%{escaped}%"]
+
+        if chat_id is not None:
+            condition += " AND chat_id = ?"
+            params.append(chat_id)
+
+        matches: Dict[str, List[tuple]] = defaultdict(list)
+        for match_chat_id, message_id, log_offset in conn.execute(
+            f"SELECT chat_id, message_id, log_offset FROM messages_fts WHERE {condition} ORDER BY rowid",
+            params
+        ):
+            matches[match_chat_id].append((log_offset, message_id))
+
+        return matches
@@ -4,9 +4,16 @@ Handles persistence and disk I/O for all data
 """
 
 import os
+import atexit
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from typing import Optional, List
 from pathlib import Path
 
+import orjson
+
 from .models import Project, Chat, Message, AppConfig
 from .utils import (
     ensure_directory,
@@ -14,12 +21,149 @@ from .utils import (
     safe_write_json,
     get_metadata_path,
     get_chat_file_path,
+    get_chat_index_path,
+    ORJSON_OPTIONS,
+    get_messages_log_path,
+    get_gemini_history_log_path,
     get_project_directory,
     get_eda_context_path,
     delete_directory
 )
 
 
+# Message.result types that orjson writes exactly as Message.to_dict() stores them
+_NATIVE_RESULT_TYPES = (type(None), str, int, float, bool, list, dict)
+
+
+def _dump_message_record(record) -> bytes:
+    """
+    Serialize one message log line from a Message or a message dict
+    orjson serializes Message dataclasses straight from their fields (same
+    output as to_dict(), without building the dict) - only a result that
+    to_dict() converts goes through to_dict()
+    """
+    if isinstance(record, Message) and type(record.result) not in _NATIVE_RESULT_TYPES:
+        record = record.to_dict()
+    return orjson.dumps(record, option=ORJSON_OPTIONS) + b"\n"
+
+
+class _MessageWriter:
+    """
+    Process-wide write buffer for chat message logs
+    Appends to a chat are coalesced and written with one write + fsync (plus
+    one metadata save) once FLUSH_BYTES are buffered or FLUSH_DELAY seconds
+    after the first buffered append. Shared by every StateManager so reads
+    through any of them see buffered messages.
+    """
+
+    FLUSH_BYTES = 64 * 1024
+    FLUSH_DELAY = 0.05
+
+    def __init__(self):
+        # Key: message log path, Value: [records, size, chat, save_metadata]
+        self._pending: dict[str, list] = {}
+        # Key: message log path, Value: chat metadata being written by flush()
+        # - still served by pending_chat() until its save has returned
+        self._in_flight: dict[str, Chat] = {}
+        self._lock = threading.Lock()
+        # Held while writing, so batches for a log land in order
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def append(self, log_path: str, save_metadata, chat: Chat, record: bytes) -> None:
+        """
+        Buffer one serialized message and the chat metadata that goes with it
+        save_metadata(chat) is called after the batch is written
+        """
+        with self._lock:
+            entry = self._pending.setdefault(log_path, [[], 0, chat, save_metadata])
+            entry[0].append(record)
+            entry[1] += len(record)
+            entry[2] = chat
+            full = entry[1] >= self.FLUSH_BYTES
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.FLUSH_DELAY, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
+            self.flush(log_path)
+
+    def pending_chat(self, log_path: str) -> Optional[Chat]:
+        """Chat metadata not yet written for a log, or None"""
+        with self._lock:
+            entry = self._pending.get(log_path)
+            if entry is not None:
+                return replace(entry[2])
+            chat = self._in_flight.get(log_path)
+            return replace(chat) if chat is not None else None
+
+    def discard(self, log_path: str) -> None:
+        """Drop buffered messages for a log that is being replaced or deleted"""
+        with self._flush_lock, self._lock:
+            self._pending.pop(log_path, None)
+
+    def discard_under(self, directory: str) -> None:
+        """Drop buffered messages for every log in a directory being deleted"""
+        prefix = os.path.join(directory, "")
+        with self._flush_lock, self._lock:
+            for log_path in [p for p in self._pending if p.startswith(prefix)]:
+                del self._pending[log_path]
+
+    def flush(self, log_path: Optional[str] = None) -> bool:
+        """
+        Write buffered messages for one log (or all logs)
+
+        Returns:
+            True if everything was written
+        """
+        with self._flush_lock:
+            with self._lock:
+                if log_path is None:
+                    batches = list(self._pending.items())
+                    self._pending.clear()
+                else:
+                    entry = self._pending.pop(log_path, None)
+                    batches = [(log_path, entry)] if entry is not None else []
+                for path, (_, _, chat, _) in batches:
+                    self._in_flight[path] = chat
+
+            success = True
+            for path, (records, _, chat, save_metadata) in batches:
+                try:
+                    with open(path, "ab") as f:
+                        f.write(b"".join(records))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    success = save_metadata(chat) and success
+                except Exception as e:
+                    print(f"Error appending messages to chat {chat.id}: {e}")
+                    success = False
+                finally:
+                    with self._lock:
+                        if self._in_flight.get(path) is chat:
+                            del self._in_flight[path]
+            return success
+
+    def _flush_on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+
+_message_writer = _MessageWriter()
+atexit.register(_message_writer.flush)
+
+# Threads for reading chat metadata files the chat index could not serve
+CHAT_LOAD_WORKERS = 32
+
+# Bytes read per step when reading message logs in pieces
+_LOG_READ_BLOCK = 64 * 1024
+
+# Serializes read-modify-write of chats_index.json files
+_chat_index_lock = threading.Lock()
+
+
 class StateManager:
     """
     Manages persistence of all application state to disk
@@ -138,6 +282,7 @@ class StateManager:
         Removes entire project directory
         """
         project_dir = get_project_directory(self.base_dir, project_id)
+        _message_writer.discard_under(project_dir)
         return delete_directory(project_dir)
 
     def project_exists(self, project_id: str) -> bool:
@@ -147,29 +292,81 @@ class StateManager:
 
     # ===== Chat Operations =====
 
+    # Chat metadata lives in {chat_id}.json and messages in an append-only
+    # {chat_id}.messages.jsonl log, so adding a message never rewrites the
+    # whole history
+
     def save_chat(self, chat: Chat, messages: List[Message]) -> bool:
         """
         Save chat and its messages to disk
-        Overwrites existing chat file
+        Overwrites existing chat file and message log
         """
+        # Buffered appends are superseded by the full message list
+        _message_writer.discard(get_messages_log_path(self.base_dir, chat.project_id, chat.id))
+        chat.user_message_count = sum(1 for msg in messages if msg.role == "user")
+        chat.assistant_message_count = sum(1 for msg in messages if msg.role == "assistant")
+        if not self._write_message_log(chat.project_id, chat.id, messages):
+            return False
+        return self.save_chat_metadata(chat)
+
+    def save_chat_metadata(self, chat: Chat) -> bool:
+        """
+        Save only chat metadata (messages are untouched)
+        Returns True if successful
+        """
+        # Buffered messages go out first so the log never lags the metadata
+        _message_writer.flush(get_messages_log_path(self.base_dir, chat.project_id, chat.id))
+        return self._write_chat_metadata(chat)
+
+    def _write_chat_metadata(self, chat: Chat) -> bool:
+        """Write a chat's metadata file and its entry in the project's chat index"""
+        # safe_write_json() creates the chats directory if needed
         chat_path = get_chat_file_path(self.base_dir, chat.project_id, chat.id)
+        if not safe_write_json(chat_path, chat.to_dict()):
+            return False
+        self._update_chat_index(chat.project_id, upsert=[chat])
+        return True
 
-        # Ensure chats directory exists
-        ensure_directory(os.path.dirname(chat_path))
+    def append_message(self, chat: Chat, message: Message) -> bool:
+        """
+        Append one message to the chat's log and save the updated metadata
+        Callers update chat.message_count / updated_at first. The write is
+        buffered briefly (see _MessageWriter) - call flush_messages() to
+        force it out
 
-        # Prepare chat data with messages
-        chat_data = chat.to_dict()
-        chat_data["messages"] = [msg.to_dict() for msg in messages]
+        Returns:
+            True if the message was queued
+        """
+        try:
+            record = _dump_message_record(message)
+        except Exception as e:
+            print(f"Error serializing message for chat {chat.id}: {e}")
+            return False
+
+        _message_writer.append(
+            get_messages_log_path(self.base_dir, chat.project_id, chat.id),
+            self._write_chat_metadata,
+            chat,
+            record
+        )
+        return True
 
-        return safe_write_json(chat_path, chat_data)
+    def flush_messages(self, project_id: Optional[str] = None, chat_id: Optional[str] = None) -> bool:
+        """
+        Write buffered messages to disk now (one chat, or all chats if no IDs)
+        Returns True if successful
+        """
+        if project_id is None or chat_id is None:
+            return _message_writer.flush()
+        return _message_writer.flush(get_messages_log_path(self.base_dir, project_id, chat_id))
 
     def load_chat(self, project_id: str, chat_id: str) -> Optional[tuple[Chat, List[Message]]]:
         """
         Load chat and its messages from disk
         Returns tuple of (Chat, List[Message]) or None if not found
         """
-        chat_path = get_chat_file_path(self.base_dir, project_id, chat_id)
-        data = safe_read_json(chat_path)
+        self.flush_messages(project_id, chat_id)
+        data = self._read_chat_data(project_id, chat_id)
 
         if data is None:
             return None
@@ -178,12 +375,390 @@ class StateManager:
         chat = Chat.from_dict(data)
 
         # Deserialize messages
-        messages = []
-        for msg_data in data.get("messages", []):
-            messages.append(Message.from_dict(msg_data))
+        messages, _ = self.load_messages(project_id, chat_id)
 
         return chat, messages
 
+    def load_messages(self, project_id: str, chat_id: str, offset: int = 0) -> tuple[List[Message], int]:
+        """
+        Load messages from the chat's log, starting at a byte offset
+        Callers that already hold the first part of the log read only what
+        was appended since
+
+        Returns:
+            (messages, offset just past the last complete record read)
+        """
+        records, end = self._read_message_log(project_id, chat_id, offset)
+        return [Message.from_dict(msg_data) for msg_data in records], end
+
+    def load_last_messages(self, project_id: str, chat_id: str, n: int) -> List[Message]:
+        """
+        Load the last n messages, reading the log backwards from its end
+        Cost depends on n, not on the length of the chat
+
+        Returns:
+            Up to n messages (chronological order)
+        """
+        if n <= 0:
+            return []
+
+        self.flush_messages(project_id, chat_id)
+        log_path = get_messages_log_path(self.base_dir, project_id, chat_id)
+
+        try:
+            with open(log_path, "rb") as f:
+                end = f.seek(0, os.SEEK_END)
+                start = end
+                tail = b""
+                # n complete records need n + 1 newlines (or the start of the file)
+                while start > 0 and tail.count(b"\n") <= n:
+                    start = max(0, start - _LOG_READ_BLOCK)
+                    f.seek(start)
+                    tail = f.read(end - start)
+        except FileNotFoundError:
+            return []
+
+        # Drop a partial first line (unless at the start) and an unfinished last one
+        if start > 0:
+            tail = tail[tail.find(b"\n") + 1:]
+        tail = tail[:tail.rfind(b"\n") + 1]
+
+        records = self._parse_records(tail, chat_id)
+        return [Message.from_dict(msg_data) for msg_data in records[-n:]]
+
+    def load_messages_page(
+        self,
+        project_id: str,
+        chat_id: str,
+        cursor: int = 0,
+        page_size: int = 50
+    ) -> tuple[List[Message], Optional[int]]:
+        """
+        Load one page of messages, oldest first
+        The cursor is a byte offset into the message log, so each page reads
+        only its own records
+
+        Args:
+            project_id: Project UUID
+            chat_id: Chat UUID
+            cursor: 0 for the first page, else the next_cursor of the previous page
+            page_size: Messages per page
+
+        Returns:
+            (messages, next_cursor - None after the last page)
+        """
+        self.flush_messages(project_id, chat_id)
+        log_path = get_messages_log_path(self.base_dir, project_id, chat_id)
+
+        lines = []
+        try:
+            with open(log_path, "rb") as f:
+                f.seek(cursor)
+                while len(lines) < page_size:
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        # End of file, or an append still in progress
+                        break
+                    lines.append(line)
+                    cursor += len(line)
+                more = f.readline().endswith(b"\n")
+        except FileNotFoundError:
+            return [], None
+
+        records = self._parse_records(b"".join(lines), chat_id)
+        messages = [Message.from_dict(msg_data) for msg_data in records]
+        return messages, cursor if more else None
+
+    def read_message_records(
+        self,
+        project_id: str,
+        chat_id: str,
+        offset: int = 0
+    ) -> tuple[List[tuple[int, dict]], int]:
+        """
+        Read raw message records from a byte offset of the message log, each
+        with the offset it starts at (buffered appends are not flushed)
+
+        Returns:
+            ([(record_offset, record), ...], offset after the last complete record)
+        """
+        log_path = get_messages_log_path(self.base_dir, project_id, chat_id)
+
+        try:
+            with open(log_path, "rb") as f:
+                f.seek(offset)
+                content = f.read()
+        except FileNotFoundError:
+            return [], 0
+
+        records = []
+        position = offset
+        for line in content.split(b"\n")[:-1]:
+            start, position = position, position + len(line) + 1
+            if not line.strip():
+                continue
+            try:
+                records.append((start, orjson.loads(line)))
+            except orjson.JSONDecodeError as e:
+                print(f"Warning: Skipping corrupt message in chat {chat_id}: {e}")
+        return records, position
+
+    def load_messages_at(self, project_id: str, chat_id: str, offsets: List[int]) -> List[Message]:
+        """
+        Load the messages starting at the given byte offsets of the message log
+        Offsets that no longer point at a complete record are skipped
+        """
+        log_path = get_messages_log_path(self.base_dir, project_id, chat_id)
+        messages = []
+
+        try:
+            with open(log_path, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        continue
+                    try:
+                        messages.append(Message.from_dict(orjson.loads(line)))
+                    except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError):
+                        continue
+        except FileNotFoundError:
+            return []
+
+        return messages
+
+    def chat_file_state(self, project_id: str, chat_id: str) -> Optional[tuple]:
+        """
+        Cheap change marker for a chat's files, taken after buffered appends
+        are written - metadata identity plus message log identity and size
+
+        Returns:
+            ((inode, mtime_ns, size) of the metadata file, (device, inode) of
+            the message log, log size) or None if the chat does not exist
+        """
+        self.flush_messages(project_id, chat_id)
+
+        try:
+            meta = os.stat(get_chat_file_path(self.base_dir, project_id, chat_id))
+        except FileNotFoundError:
+            return None
+
+        try:
+            log = os.stat(get_messages_log_path(self.base_dir, project_id, chat_id))
+            log_id, log_size = (log.st_dev, log.st_ino), log.st_size
+        except FileNotFoundError:
+            log_id, log_size = None, 0
+
+        return (meta.st_ino, meta.st_mtime_ns, meta.st_size), log_id, log_size
+
+    def load_chat_metadata(self, project_id: str, chat_id: str) -> Optional[Chat]:
+        """
+        Load only chat metadata (the message log is not read)
+        Returns None if not found
+        """
+        # Metadata of buffered appends is served from memory
+        pending = _message_writer.pending_chat(get_messages_log_path(self.base_dir, project_id, chat_id))
+        if pending is not None:
+            return pending
+
+        data = self._read_chat_data(project_id, chat_id)
+
+        if data is None:
+            return None
+
+        return Chat.from_dict(data)
+
+    def load_chat_index(self, project_id: str) -> List[Chat]:
+        """
+        Load metadata of every chat in a project from the project's chat index
+        One file read plus a stat per chat - a chat whose metadata file no
+        longer matches its index entry (or is missing from the index) is read
+        from its own file and the index is repaired. Index entries leave out
+        gemini_chat_history.
+
+        Returns:
+            List of Chat objects (unsorted)
+        """
+        index = safe_read_json(get_chat_index_path(self.base_dir, project_id), default={})
+        if not isinstance(index, dict):
+            index = {}
+
+        chats = []
+        missed = []
+        for chat_id in self.list_chat_ids(project_id):
+            pending = _message_writer.pending_chat(get_messages_log_path(self.base_dir, project_id, chat_id))
+            if pending is not None:
+                chats.append(pending)
+                continue
+
+            entry = index.get(chat_id)
+            try:
+                mtime_ns = os.stat(get_chat_file_path(self.base_dir, project_id, chat_id)).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            if entry is not None and entry.get("mtime_ns") == mtime_ns:
+                chats.append(Chat.from_dict(entry))
+                continue
+
+            missed.append(chat_id)
+
+        # Index misses are independent small reads - overlap them (all chats
+        # miss the first time a project without an index is listed)
+        if len(missed) > 1:
+            with ThreadPoolExecutor(max_workers=min(CHAT_LOAD_WORKERS, len(missed))) as executor:
+                loaded = list(executor.map(lambda chat_id: self.load_chat_metadata(project_id, chat_id), missed))
+        else:
+            loaded = [self.load_chat_metadata(project_id, chat_id) for chat_id in missed]
+
+        stale = [chat for chat in loaded if chat is not None]
+        chats.extend(stale)
+
+        if stale or len(index) != len(chats):
+            self._update_chat_index(project_id, upsert=stale, keep={c.id for c in chats})
+
+        return chats
+
+    def _update_chat_index(
+        self,
+        project_id: str,
+        upsert: List[Chat] = (),
+        remove: Optional[str] = None,
+        keep: Optional[set] = None
+    ) -> None:
+        """
+        Upsert / remove entries in the project's chat index (atomic rewrite)
+        keep: if given, drop every entry whose chat ID is not in it
+        """
+        index_path = get_chat_index_path(self.base_dir, project_id)
+
+        with _chat_index_lock:
+            index = safe_read_json(index_path, default={})
+            if not isinstance(index, dict):
+                index = {}
+
+            for chat in upsert:
+                entry = chat.to_dict()
+                entry["gemini_chat_history_len"] = len(entry.pop("gemini_chat_history"))
+                try:
+                    entry["mtime_ns"] = os.stat(
+                        get_chat_file_path(self.base_dir, project_id, chat.id)
+                    ).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                index[chat.id] = entry
+
+            if remove is not None:
+                index.pop(remove, None)
+            if keep is not None:
+                index = {chat_id: entry for chat_id, entry in index.items() if chat_id in keep}
+
+            safe_write_json(index_path, index, indent=0)
+
+    def compact_message_log(self, chat: Chat) -> bool:
+        """
+        Rewrite a chat's message log without torn or corrupt lines and without
+        repeated message IDs (the first copy is kept), then bump chat.epoch so
+        page cursors into the old log are rejected
+        A log that is already clean is left alone. Appends from other
+        processes during the rewrite are lost, as with save_chat().
+        Returns True if successful
+        """
+        log_path = get_messages_log_path(self.base_dir, chat.project_id, chat.id)
+        _message_writer.flush(log_path)
+
+        try:
+            with open(log_path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return True
+
+        seen = set()
+        live = []
+        for record in self._parse_records(content[:content.rfind(b"\n") + 1], chat.id):
+            if record.get("id") in seen:
+                continue
+            seen.add(record.get("id"))
+            live.append(record)
+
+        if not content or (content.endswith(b"\n") and len(live) == content.count(b"\n")):
+            return True
+
+        chat.epoch += 1
+        chat.message_count = len(live)
+        chat.user_message_count = sum(1 for record in live if record.get("role") == "user")
+        chat.assistant_message_count = sum(1 for record in live if record.get("role") == "assistant")
+        if not self._write_message_log(chat.project_id, chat.id, live):
+            return False
+        return self._write_chat_metadata(chat)
+
+    def _read_chat_data(self, project_id: str, chat_id: str) -> Optional[dict]:
+        """
+        Read a chat's metadata file
+        Older chat files embed their messages - those are moved to the message
+        log the first time the chat is read
+        """
+        chat_path = get_chat_file_path(self.base_dir, project_id, chat_id)
+        data = safe_read_json(chat_path)
+
+        if data is None or "messages" not in data:
+            return data
+
+        messages = data.pop("messages")
+        if self._write_message_log(project_id, chat_id, messages):
+            safe_write_json(chat_path, data)
+        return data
+
+    def _read_message_log(self, project_id: str, chat_id: str, offset: int = 0) -> tuple[List[dict], int]:
+        """Read a chat's message log from a byte offset (empty if there is none)"""
+        log_path = get_messages_log_path(self.base_dir, project_id, chat_id)
+
+        try:
+            with open(log_path, "rb") as f:
+                f.seek(offset)
+                content = f.read()
+        except FileNotFoundError:
+            return [], 0
+
+        # A line without its newline is an append still in progress - skip it
+        complete = content.rfind(b"\n") + 1
+        return self._parse_records(content[:complete], chat_id), offset + complete
+
+    @staticmethod
+    def _parse_records(content: bytes, chat_id: str) -> List[dict]:
+        """Parse newline-terminated JSON records"""
+        records = []
+        for line in content.split(b"\n")[:-1]:
+            if not line.strip():
+                continue
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError as e:
+                # Torn write from a crash - drop that record, keep the rest
+                print(f"Warning: Skipping corrupt message in chat {chat_id}: {e}")
+        return records
+
+    def _write_message_log(self, project_id: str, chat_id: str, messages: list) -> bool:
+        """Replace a chat's message log atomically (temp file + rename)"""
+        log_path = get_messages_log_path(self.base_dir, project_id, chat_id)
+        temp_path = None
+
+        try:
+            ensure_directory(os.path.dirname(log_path))
+            temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(log_path), suffix=".jsonl.tmp")
+            with os.fdopen(temp_fd, "wb") as f:
+                f.write(b"".join(_dump_message_record(msg) for msg in messages))
+                # Durable before the rename, so a crash leaves the old or the new log
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, log_path)
+            return True
+        except Exception as e:
+            print(f"Error writing messages for chat {chat_id}: {e}")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return False
+
     def list_chat_ids(self, project_id: str) -> List[str]:
         """
         List all chat IDs for a project
@@ -227,15 +802,20 @@ class StateManager:
 
     def delete_chat(self, project_id: str, chat_id: str) -> bool:
         """
-        Delete chat file
+        Delete chat file and its logs
         Returns True if successful
         """
         chat_path = get_chat_file_path(self.base_dir, project_id, chat_id)
+        log_path = get_messages_log_path(self.base_dir, project_id, chat_id)
+        _message_writer.discard(log_path)
 
         try:
             if os.path.exists(chat_path):
                 os.remove(chat_path)
-            return True
+            if os.path.exists(log_path):
+                os.remove(log_path)
+            self._update_chat_index(project_id, remove=chat_id)
+            return self.delete_gemini_history_log(project_id, chat_id)
         except Exception as e:
             print(f"Error deleting chat {chat_id}: {e}")
             return False
@@ -245,6 +825,70 @@ class StateManager:
         chat_path = get_chat_file_path(self.base_dir, project_id, chat_id)
         return os.path.exists(chat_path)
 
+    # ===== Gemini History Log =====
+
+    def append_gemini_history(
+        self,
+        project_id: str,
+        chat_id: str,
+        entries: list,
+        truncate: bool = False
+    ) -> bool:
+        """
+        Append Gemini history entries to the chat's JSONL log
+        Each turn costs one small append instead of rewriting the chat file
+
+        Args:
+            project_id: Project UUID
+            chat_id: Chat UUID
+            entries: Serializable history entries (list of dicts)
+            truncate: Start the log over (first write of a new session)
+
+        Returns:
+            True if successful
+        """
+        log_path = get_gemini_history_log_path(self.base_dir, project_id, chat_id)
+
+        try:
+            ensure_directory(os.path.dirname(log_path))
+            with open(log_path, "wb" if truncate else "ab") as f:
+                f.write(b"".join(orjson.dumps(entry, option=ORJSON_OPTIONS) + b"\n" for entry in entries))
+            return True
+        except Exception as e:
+            print(f"Error appending Gemini history for chat {chat_id}: {e}")
+            return False
+
+    def load_gemini_history_log(self, project_id: str, chat_id: str) -> Optional[list]:
+        """
+        Load the chat's Gemini history log
+        Returns None if there is no log (history lives in the chat file)
+        """
+        log_path = get_gemini_history_log_path(self.base_dir, project_id, chat_id)
+
+        try:
+            with open(log_path, "rb") as f:
+                return [orjson.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading Gemini history for chat {chat_id}: {e}")
+            return None
+
+    def delete_gemini_history_log(self, project_id: str, chat_id: str) -> bool:
+        """
+        Delete the chat's Gemini history log
+        Returns True if successful
+        """
+        log_path = get_gemini_history_log_path(self.base_dir, project_id, chat_id)
+
+        try:
+            if os.path.exists(log_path):
+                os.remove(log_path)
+            return True
+        except Exception as e:
+            print(f"Error deleting Gemini history log for chat {chat_id}: {e}")
+            return False
+
     # ===== EDA Context Operations =====
 
     def save_eda_context(self, project_id: str, eda_context: dict) -> bool:
@@ -7,11 +7,33 @@ import os
 import json
 import shutil
 import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Optional, Union
 from datetime import datetime
+import orjson
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+
+# pd.read_csv's default NA tokens (pandas._libs.parsers.STR_NA_VALUES) -
+# pyarrow's defaults lack "None" and "<NA>"
+CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null"
+]
+
+# orjson options for everything persisted as JSON - numpy scalars and
+# non-string dict keys are written like json.dump would (keys as strings)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
 
 def ensure_directory(path: str) -> None:
     """
@@ -21,6 +43,16 @@ def ensure_directory(path: str) -> None:
     Path(path).mkdir(parents=True, exist_ok=True)
 
 
+@lru_cache(maxsize=4096)
+def ensure_directory_cached(path: str) -> None:
+    """
+    ensure_directory() memoized per process, for hot write paths
+    Cleared by delete_directory(); callers must handle the directory having
+    been removed by something else since it was cached
+    """
+    ensure_directory(path)
+
+
 def safe_read_json(file_path: str, default: Any = None) -> Any:
     """
     Safely read JSON file with error handling
@@ -30,9 +62,15 @@ def safe_read_json(file_path: str, default: Any = None) -> Any:
         if not os.path.exists(file_path):
             return default
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        with open(file_path, 'rb') as f:
+            content = f.read()
+
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Files written by json.dump may hold NaN/Infinity, which orjson rejects
+            return json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError, IOError) as e:
         print(f"Warning: Failed to read {file_path}: {e}")
         return default
 
@@ -43,18 +81,24 @@ def safe_write_json(file_path: str, data: Any, indent: int = 2) -> bool:
     Writes to temp file first, then renames to prevent corruption
     """
     try:
-        # Ensure directory exists
-        ensure_directory(os.path.dirname(file_path))
+        # Ensure directory exists (mkdir only the first time per process)
+        dir_path = os.path.dirname(file_path)
+        ensure_directory_cached(dir_path)
 
         # Write to temporary file first
-        temp_fd, temp_path = tempfile.mkstemp(
-            dir=os.path.dirname(file_path),
-            suffix='.json.tmp'
-        )
+        try:
+            temp_fd, temp_path = tempfile.mkstemp(dir=dir_path, suffix='.json.tmp')
+        except FileNotFoundError:
+            # Directory was removed since it was cached - recreate it
+            ensure_directory_cached.cache_clear()
+            ensure_directory(dir_path)
+            temp_fd, temp_path = tempfile.mkstemp(dir=dir_path, suffix='.json.tmp')
 
         try:
-            with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=indent, ensure_ascii=False)
+            # orjson supports 2-space indentation only (any indent > 0)
+            option = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
 
             # Atomic rename
             shutil.move(temp_path, file_path)
@@ -106,6 +150,76 @@ def get_csv_info(file_path: str) -> dict:
         }
 
 
+def read_csv_fast(file_path: Union[str, BinaryIO]) -> pd.DataFrame:
+    """
+    Read CSV with pyarrow's multithreaded parser, falling back to pandas
+    Output matches pd.read_csv: pandas' NA tokens (empty, NA, None, ...) are
+    nulls and date/time columns stay as strings so the data round-trips through to_csv unchanged
+
+    Accepts a path or a seekable binary file object (e.g. an upload buffer)
+    """
+    def rewind():
+        if hasattr(file_path, "seek"):
+            file_path.seek(0)
+
+    if pacsv is not None:
+        try:
+            rewind()
+            read_options = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+
+            # Probe the first block's schema to keep temporal columns as text
+            reader = pacsv.open_csv(
+                file_path,
+                read_options=read_options,
+                convert_options=pacsv.ConvertOptions(
+                    null_values=CSV_NA_VALUES,
+                    strings_can_be_null=True
+                )
+            )
+            text_columns = {
+                f.name: pa.string() for f in reader.schema if pa.types.is_temporal(f.type)
+            }
+            reader.close()
+
+            rewind()
+            table = pacsv.read_csv(
+                file_path,
+                read_options=read_options,
+                convert_options=pacsv.ConvertOptions(
+                    null_values=CSV_NA_VALUES,
+                    strings_can_be_null=True,
+                    column_types=text_columns
+                )
+            )
+
+            # pandas de-duplicates repeated headers (a, a.1); leave that to it
+            if len(set(table.column_names)) == table.num_columns:
+                # All-null columns and booleans with nulls come out as object
+                # columns holding None - pandas has float64 / object with NaN
+                null_columns = [f.name for f in table.schema if pa.types.is_null(f.type)]
+                nullable_bools = [
+                    f.name for f in table.schema
+                    if pa.types.is_boolean(f.type) and table.column(f.name).null_count
+                ]
+                df = table.to_pandas(split_blocks=True, self_destruct=True)
+                for name in null_columns:
+                    df[name] = df[name].astype("float64")
+                for name in nullable_bools:
+                    df[name] = df[name].where(df[name].notna(), float("nan"))
+                return df
+
+        except pa.ArrowException:
+            pass  # Let pandas parse it (and raise its own error if invalid)
+
+    rewind()
+    return pd.read_csv(
+        file_path,
+        engine="c",
+        memory_map=isinstance(file_path, str),
+        low_memory=False
+    )
+
+
 def format_timestamp(dt: datetime, format_str: str = "%Y%m%d_%H%M%S") -> str:
     """
     Format datetime as string for filenames
@@ -142,6 +256,7 @@ def delete_directory(path: str) -> bool:
     try:
         if os.path.exists(path):
             shutil.rmtree(path)
+            ensure_directory_cached.cache_clear()
         return True
     except Exception as e:
         print(f"Error deleting directory {path}: {e}")
@@ -230,6 +345,26 @@ def get_chat_file_path(base_dir: str, project_id: str, chat_id: str) -> str:
     return os.path.join(base_dir, "projects", project_id, "chats", f"{chat_id}.json")
 
 
+def get_chat_index_path(base_dir: str, project_id: str) -> str:
+    """Get path to a project's chat metadata index (one entry per chat)"""
+    return os.path.join(base_dir, "projects", project_id, "chats_index.json")
+
+
+def get_messages_log_path(base_dir: str, project_id: str, chat_id: str) -> str:
+    """Get path to a chat's append-only message log (JSONL)"""
+    return os.path.join(base_dir, "projects", project_id, "chats", f"{chat_id}.messages.jsonl")
+
+
+def get_gemini_history_log_path(base_dir: str, project_id: str, chat_id: str) -> str:
+    """Get path to a chat's append-only Gemini history log (JSONL)"""
+    return os.path.join(base_dir, "projects", project_id, "chats", f"{chat_id}.gemini.jsonl")
+
+
+def get_search_db_path(base_dir: str, project_id: str) -> str:
+    """Get path to a project's message search index (SQLite)"""
+    return os.path.join(base_dir, "projects", project_id, "search.db")
+
+
 def get_current_csv_path(base_dir: str, project_id: str) -> str:
     """Get path to current CSV file"""
     return os.path.join(base_dir, "projects", project_id, "current.csv")
@@ -3,6 +3,7 @@ Test script for Phase 1 - Core Infrastructure
 Tests all managers and models
 """
 
+import io
 import os
 import sys
 import pandas as pd
@@ -15,7 +16,10 @@ sys.path.insert(0, os.path.dirname(__file__))
 from src.project_manager import ProjectManager
 from src.version_manager import VersionManager
 from src.state_manager import StateManager
+from src.chat_manager import ChatManager
 from src.models import Project, Chat, Message, Version, AppConfig
+from src.code_worker import _compile
+from src.utils import read_csv_fast
 
 
 def cleanup_test_data():
@@ -141,6 +145,119 @@ def test_state_manager():
     print("✓ Load all projects works")
 
 
+def test_buffered_message_counts():
+    """Test that a message added while its chat's batch is being flushed is counted"""
+    print("\n=== Testing Buffered Message Counts ===")
+
+    # Add one more message from inside the flush, after the batch has left the
+    # buffer but before its metadata is saved
+    original_write = StateManager._write_chat_metadata
+    flushing = []
+    added = []
+
+    def write_and_add(self, saved_chat):
+        if flushing and not added:
+            added.append(cm.add_user_message("project-buffered", chat.id, "During flush"))
+        return original_write(self, saved_chat)
+
+    StateManager._write_chat_metadata = write_and_add
+    try:
+        cm = ChatManager("data_test")
+        chat = cm.create_chat("project-buffered", "Buffered Chat")
+        for i in range(3):
+            cm.add_user_message("project-buffered", chat.id, f"Message {i}")
+
+        flushing.append(True)
+        cm.flush_messages("project-buffered", chat.id)
+    finally:
+        StateManager._write_chat_metadata = original_write
+    cm.flush_messages()
+
+    saved = cm.get_chat_metadata("project-buffered", chat.id)
+    assert added[0] is not None
+    assert saved.message_count == 4
+    assert saved.user_message_count == 4
+    assert len(cm.get_messages("project-buffered", chat.id)) == 4
+    print("✓ Message added during a flush kept its count")
+
+
+def test_read_csv_fast():
+    """Test that the pyarrow CSV path reads the same DataFrame as pd.read_csv"""
+    print("\n=== Testing Fast CSV Reader ===")
+
+    samples = {
+        "NA tokens": b"a,b\n1,NA\n2,None\n",
+        "mixed": (
+            b"id,name,score,joined,flag,note\n"
+            b"1,Alice,NA,2024-01-05,True,\n"
+            b"2,None,3.5,2024-02-10,False,x\n"
+            b"3,,N/A,,True,<NA>\n"
+            b"4,Dan,null,2024-03-01 10:00:00,,NULL\n"
+        ),
+        "empty strings": b"a,b,c\n1,,x\n2,,\n",
+    }
+    for label, data in samples.items():
+        pd.testing.assert_frame_equal(
+            read_csv_fast(io.BytesIO(data)), pd.read_csv(io.BytesIO(data)), obj=label
+        )
+    print("✓ NA tokens, empty strings and dates match pd.read_csv")
+
+
+def test_code_validator():
+    """Test that generated code can't reach blocked modules through allowed ones"""
+    print("\n=== Testing Code Validator ===")
+
+    blocked = [
+        'pd.io.common.os.system("echo pwned")',
+        'common = pd.io.common\ncommon.os.system("echo pwned")',
+        'from pandas.io import common\ncommon.os.system("echo pwned")',
+        'from pandas.io.common import os',
+        'import pandas.io.common as common\ncommon.mmap',
+        'import os',
+        'df.__class__',
+    ]
+    for source in blocked:
+        try:
+            _compile(source)
+        except ValueError:
+            continue
+        raise AssertionError(f"Validator accepted: {source!r}")
+    print("✓ Chained-attribute access to blocked modules rejected")
+
+    allowed = [
+        'result = df.groupby("a").sum()',
+        'import numpy as np\nprint(np.mean([1, 2]))',
+        'import re\npattern = re.compile("a+")',
+        'df.eval("a + b")',
+        'plt.figure()\nplt.savefig("chart.png")',
+    ]
+    for source in allowed:
+        _compile(source)
+    print("✓ Ordinary analysis code accepted")
+
+
+def test_api_error_cors():
+    """Test that an unhandled error becomes a JSON 500 that still has CORS headers"""
+    print("\n=== Testing API Error Responses ===")
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    def failing_route():
+        raise RuntimeError("boom")
+
+    app.add_api_route("/api/test-error", failing_route)
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        response = client.get("/api/test-error", headers={"Origin": "http://localhost:5173"})
+    finally:
+        app.router.routes.pop()
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "boom"}
+    assert response.headers.get("access-control-allow-origin") == "http://localhost:5173"
+    print("✓ 500 response carries CORS headers")
+
+
 def test_version_manager():
     """Test VersionManager"""
     print("\n=== Testing VersionManager ===")
@@ -349,6 +466,10 @@ def run_all_tests():
     try:
         test_models()
         test_state_manager()
+        test_buffered_message_counts()
+        test_read_csv_fast()
+        test_code_validator()
+        test_api_error_cors()
         test_version_manager()
         test_project_manager()
         test_integration()
@@ -7,6 +7,7 @@ Tests Gemini integration, code generation, and execution
 import os
 import sys
 import shutil
+import numpy as np
 import pandas as pd
 import warnings
 warnings.filterwarnings('ignore')
@@ -51,6 +52,86 @@ def print_section(title):
     print('='*60)
 
 
+def test_semantic_cache_literals():
+    """Test that near-duplicate queries differing in a literal miss the response cache"""
+    print_section("RESPONSE CACHE - LITERAL MATCHING")
+
+    agent = AIAgent(api_key="test-key", base_dir=TEST_DIR)
+    agent.system_instruction = "DATASET CONTEXT: employees"
+    # Every query embeds to the same vector, so only the literal check tells them apart
+    agent._embed_query = lambda query: np.ones(4, dtype=np.float32) / 2
+
+    query = "Show the top 5 cities by salary"
+    agent._store_cached_response(query, agent._embed_query(query), "exploratory",
+                                 "print(df.nlargest(5, 'salary'))", "Top 5")
+
+    cached, _ = agent._lookup_cached_response("show the top 5 cities by salary please")
+    assert cached is not None and cached["code"] == "print(df.nlargest(5, 'salary'))"
+    print("✓ Near-duplicate with the same literals hits the cache")
+
+    for near_duplicate in [
+        "Show the top 10 cities by salary",
+        "Show the top 5 cities by 'age'",
+    ]:
+        cached, _ = agent._lookup_cached_response(near_duplicate)
+        assert cached is None, near_duplicate
+    print("✓ Near-duplicates with different literals miss the cache")
+
+    # Follow-ups depend on the conversation - the cache is only used on a first turn
+    class _Session:
+        history = [{"role": "user", "parts": ["Show the top 5 cities by salary"]}]
+
+    assert agent._is_first_turn() is False  # no session
+    agent.active_chat_session = _Session()
+    assert agent._is_first_turn() is False
+    _Session.history = []
+    assert agent._is_first_turn() is True
+    print("✓ Response cache only used on the first turn of a session")
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_discarded_early_run():
+    """Test that code run mid-stream is undone when the final reply doesn't match it"""
+    print_section("STREAMING - DISCARDED EARLY RUN")
+
+    class _Chunk:
+        def __init__(self, text):
+            self.text = text
+
+    class _Session:
+        history = []
+
+        def __init__(self, chunks):
+            self.chunks = chunks
+
+        def send_message(self, query, stream=False):
+            return [_Chunk(text) for text in self.chunks]
+
+    agent = AIAgent(api_key="test-key", base_dir=TEST_DIR)
+    # No response cache lookup (it would embed the query over the network)
+    agent._embed_query = lambda query: None
+    try:
+        agent.current_chat_id = "chat-early-run"
+        agent.current_dataframe = pd.DataFrame({"a": [1, 2, 3]})
+        agent.worker.load_dataframe(agent.current_dataframe)
+
+        # The code field closes (and runs) before the reply turns out truncated
+        agent.active_chat_session = _Session([
+            '{"output_type": "exploratory", "code": "df[\'b\'] = 1\\nprint(df.shape)"',
+            ', "explanation": "Adds',
+        ])
+        result = agent.process_query("add a column b", save_to_chat=False)
+        assert not result["success"]
+
+        check = agent._execute_code("print(list(df.columns))", "exploratory")
+        assert check["success"] and check["output"].strip() == "['a']", check
+        print("✓ In-place change from an early run discarded")
+    finally:
+        agent.worker.stop()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
 def test_ai_agent():
     """Test AI agent integration"""
 
@@ -215,9 +296,10 @@ def test_ai_agent():
     print(f"  User messages: {len(user_msgs)}")
     print(f"  Assistant messages: {len(assistant_msgs)}")
 
-    # Verify Gemini history was saved
-    if chat.gemini_chat_history:
-        print(f"✓ Gemini history saved: {len(chat.gemini_chat_history)} entries")
+    # Verify Gemini history was saved (appended to the history log until the session closes)
+    gemini_history = cm.get_gemini_history(project.id, chat.id)
+    if gemini_history:
+        print(f"✓ Gemini history saved: {len(gemini_history)} entries")
     else:
         print("⚠️  Gemini history not saved")
 
@@ -250,6 +332,8 @@ def test_ai_agent():
 
 if __name__ == "__main__":
     try:
+        test_semantic_cache_literals()
+        test_discarded_early_run()
         success = test_ai_agent()
 
         # Cleanup